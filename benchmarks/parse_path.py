@@ -0,0 +1,47 @@
+"""Benchmark of the SVG path d string tokenizer and parser.
+
+Builds d strings shaped like exported plot/map data (long relative
+polylines in compact number formatting, mixed with cubic curves) and
+times pd._d_parser at growing sizes. With a linear tokenizer the time
+per number stays flat as the d string grows. Parsing is timed without
+the parsed path cache.
+
+    python benchmarks/parse_path.py
+"""
+import random
+import time
+from pd._d_parser import _tokenize_path, _parse_path
+
+
+def plot_path(n, seed=0):
+    """Returns a d string with about n coordinate pairs"""
+    rnd = random.Random(seed)
+    parts = ["M12.5,300.25"]
+    for i in range(n):
+        if i % 50 == 0:
+            parts.append("c%.2f,%.2f %.2f,%.2f %.2f,%.2f" % tuple(
+                rnd.uniform(-20, 20) for _ in range(6)))
+        elif i % 10 == 0:
+            parts.append("l%.3f%+.3f" % (rnd.uniform(0, 4), rnd.uniform(-3, 3)))
+        else:
+            parts.append("%.3f%+.3f" % (rnd.uniform(0, 4), rnd.uniform(-3, 3)))
+    return "".join(parts)
+
+
+def best_of(func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    print(f"{'pairs':>9} {'chars':>10} {'tokenize s':>11} {'parse s':>9} {'us/pair':>8}")
+    for n in (1_000, 4_000, 16_000, 64_000, 256_000):
+        d = plot_path(n)
+        tokenize = best_of(lambda: sum(1 for _ in _tokenize_path(d)))
+        # _parse_path skips the parse_path() LRU cache, so every run parses
+        parse = best_of(lambda: _parse_path(d))
+        print(f"{n:>9} {len(d):>10} {tokenize:>11.4f} {parse:>9.4f} {1e6 * tokenize / n:>8.2f}")
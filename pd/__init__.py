@@ -1,8 +1,16 @@
-from pd.singleton import (canvas, save, save_gif,
-                          append_frame, set_antialiasing, put_pixel,
+from pd.singleton import (canvas, save, save_gif, start_gif, set_sink, close_sink,
+                          append_frame, set_antialiasing, put_pixel, batch, flush,
                           clear, draw_ellipse, draw_circle,
-                          draw_line, draw_rectangle, draw_path, draw_bbox)
+                          draw_line, draw_rectangle, draw_path, draw_paths, draw_bbox)
+from pd._canvas import Canvas
+from pd.gif import GifWriter
+from pd.sinks import PngSequenceSink, ApngSink, WebPSink
 from pd.path import Path
+from pd.path_batch import PathBatch
+from pd.timeline import Timeline
+from pd.morph import Morph
+from pd.render import render, render_frames
+from pd.svg import iter_svg_paths
 from pd.utils import linspace, hsv_to_rgb8, point_on_circle, map_range
 from pd.path_factory import (
     line, regular_polygon, ellipse,
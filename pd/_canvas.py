@@ -0,0 +1,311 @@
+import aggdraw
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from itertools import repeat
+from PIL import Image
+from pd.gif import GifWriter, make_palette, quantize, sample_palette
+from pd.sinks import FrameSink
+
+_local = threading.local()
+
+
+@lru_cache(maxsize=256)
+def _cached_pen(color, thickness):
+    return aggdraw.Pen(color, thickness)
+
+
+@lru_cache(maxsize=256)
+def _cached_brush(color):
+    return aggdraw.Brush(color)
+
+
+def get_pen(color, thickness=1):
+    """Returns aggdraw Pen, or None if color is None.
+
+    Pens are kept in a bounded LRU cache keyed on (color, thickness),
+    so repeated styles reuse the same object."""
+    if color is None:
+        return None
+    try:
+        return _cached_pen(color, thickness)
+    except TypeError:  # unhashable color, e.g. list
+        return aggdraw.Pen(color, thickness)
+
+
+def get_brush(color):
+    """Returns aggdraw Brush from a bounded LRU cache, or None if color is None."""
+    if color is None:
+        return None
+    try:
+        return _cached_brush(color)
+    except TypeError:
+        return aggdraw.Brush(color)
+
+
+def compound_path(coords: list[float], subpaths: tuple) -> aggdraw.Path:
+    """Returns aggdraw Path with a moveto for each subpath"""
+    if not isinstance(coords, list):
+        coords = coords.tolist()
+    path = aggdraw.Path()
+    ends = [start for start, _ in subpaths[1:]] + [len(coords) // 2]
+    for (start, closed), end in zip(subpaths, ends):
+        path.moveto(coords[start * 2], coords[start * 2 + 1])
+        for i in range(start * 2 + 2, end * 2, 2):
+            path.lineto(coords[i], coords[i + 1])
+        if closed:
+            path.close()
+    return path
+
+
+def active_canvas():
+    """Returns the Canvas activated with `with` in this thread, or None"""
+    stack = getattr(_local, "stack", None)
+    return stack[-1] if stack else None
+
+
+class Canvas():
+
+    def __init__(self, w, h, color="black"):
+        """Creates a Canvas (PIL Image surface) of the given size with its own
+        aggdraw Draw object and animation frames.
+
+        Each Canvas is independent, so several canvases can render at the
+        same time in different threads. Inside `with canvas:` the module
+        level draw functions (and Path.draw) draw on this canvas in the
+        current thread.
+        """
+        self.img = Image.new("RGBA", (w, h), color)
+        self.draw = aggdraw.Draw(self.img)
+        self.frames = []
+        self.sink: FrameSink = None
+        self._batch_depth, self._dirty = 0, False
+
+    def __enter__(self):
+        if not hasattr(_local, "stack"):
+            _local.stack = []
+        _local.stack.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        _local.stack.pop()
+
+    @property
+    def size(self) -> tuple:
+        return self.img.size
+
+    def flush(self):
+        """Pushes pending drawing to the canvas image"""
+        self.draw.flush()
+        self._dirty = False
+
+    def _flush(self):
+        if self._batch_depth:
+            self._dirty = True
+        else:
+            self.draw.flush()
+
+    @contextmanager
+    def batch(self):
+        """Batches draw calls and flushes the canvas once at the end.
+
+        Pending drawing is also flushed before the image is read
+        by save(), put_pixel() and append_frame().
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._dirty:
+                self.flush()
+
+    def put_pixel(self, xy: tuple, color: tuple = (255, 255, 255)):
+        if self._dirty:
+            self.flush()
+        self.img.putpixel(xy, color)
+
+    def set_antialiasing(self, flag=True):
+        """True to enable anti-aliasing, false to disable it."""
+        self.draw.setantialias(flag)
+
+    def clear(self, color="black"):
+        """Fills the canvas with the given color. Default is black"""
+        self.draw.clear(color)
+
+    def draw_path(self, coords: list[float], fill=80, stroke="white", thickness=1.5, closed=False,
+                  subpaths=None):
+        """Draws coordinates as path
+
+        `subpaths` ((start point index, closed) pairs, see Path.subpaths)
+        draws the coordinates as separate subpaths of one compound path,
+        e.g. a glyph with holes, in a single draw call."""
+
+        pen = get_pen(stroke, thickness)
+        brush = get_brush(fill)
+        if subpaths:
+            self.draw.path(compound_path(coords, subpaths), pen, brush)
+        elif closed:
+            self.draw.polygon(coords,  pen, brush)
+        else:
+            self.draw.path(aggdraw.Path(coords),  pen, brush)
+        self._flush()
+
+    def draw_paths(self, paths: list[list[float]], fill=80, stroke="white", thickness=1.5, closed=False,
+                   subpaths=None):
+        """Draws many coordinate lists with one pen and brush and one flush.
+
+        `closed` is a bool for all paths or a list with a bool for each path.
+        `subpaths` (see draw_path()) is one table for all paths or a list
+        with a table (or None) for each path."""
+
+        pen = get_pen(stroke, thickness)
+        brush = get_brush(fill)
+        if isinstance(closed, bool):
+            closed = repeat(closed)
+        if not isinstance(subpaths, list):
+            subpaths = repeat(subpaths)
+        for coords, is_closed, table in zip(paths, closed, subpaths):
+            if table:
+                self.draw.path(compound_path(coords, table), pen, brush)
+            elif is_closed:
+                self.draw.polygon(coords, pen, brush)
+            else:
+                self.draw.path(aggdraw.Path(coords), pen, brush)
+        self._flush()
+
+    def draw_ellipse(self, origin: tuple, radius_x, radius_y, fill=80, stroke="white", thickness=1.5):
+        """Draws ellipse immediately"""
+
+        pen = get_pen(stroke, thickness)
+        brush = get_brush(fill)
+
+        x, y = origin[0] - radius_x, origin[1] - radius_y
+        w, h = origin[0] + radius_x, origin[1] + radius_y
+
+        self.draw.ellipse((x, y, w, h), pen, brush)
+        self._flush()
+
+    def draw_circle(self, origin: tuple, radius, fill=80, stroke="white", thickness=1.5):
+        self.draw_ellipse(origin, radius, radius, fill, stroke, thickness)
+
+    def draw_line(self, start: tuple, end: tuple, stroke="white", thickness=1):
+        """Draws line immediately"""
+        pen = get_pen(stroke, thickness)
+        self.draw.line((start[0], start[1], end[0], end[1]), pen)
+        self._flush()
+
+    def draw_rectangle(self, xy: tuple, w, h, fill=80, stroke="white", thickness=1.5):
+        """The first parameter set the location of the rectangle's upper-left corner.
+        The second and third set the shape's the width and height, respectively"""
+
+        pen = get_pen(stroke, thickness)
+        brush = get_brush(fill)
+        coords = (xy[0], xy[1], xy[0] + w, xy[1] + h)
+        self.draw.rectangle(coords, pen, brush)
+        self._flush()
+
+    def draw_bbox(self, upper_left: tuple, bottom_right: tuple, fill=None, stroke="cyan", thickness=1.5):
+        """Draws bounding box rectangle.
+
+        The first parameter is bounding box's upper-left corner.
+        The second is bottom-right corner"""
+
+        pen = get_pen(stroke, thickness)
+        brush = get_brush(fill)
+        self.draw.rectangle((*upper_left, *bottom_right), pen, brush)
+        self._flush()
+
+    def save(self, filename="canvas.png"):
+        """Saves current canvas to disk"""
+        if self._dirty:
+            self.flush()
+        self.img.save(filename)
+
+    def append_frame(self):
+        """Appends the current state of the canvas to the list as a keyframe image.
+
+        Animation can then be saved with save_gif() .
+        If a frame sink is set (set_sink(), start_gif()), the frame is
+        passed to the sink instead.
+        """
+        if self._dirty:
+            self.flush()
+        if self.sink is not None:
+            self.sink.append(self.img)
+        else:
+            self.frames.append(self.img.copy())
+
+    def set_sink(self, sink: FrameSink):
+        """Sends following append_frame() calls to a frame sink.
+
+        Built-in sinks: GifWriter, PngSequenceSink, ApngSink, WebPSink.
+        Any object with append(image) and close() methods works.
+        An active sink is closed first.
+        """
+        self.close_sink()
+        self.sink = sink
+        return sink
+
+    def close_sink(self):
+        """Waits for the frame sink to finish writing and removes it"""
+        if self.sink is not None:
+            sink, self.sink = self.sink, None
+            sink.close()
+
+    def start_gif(self, filename="anim.gif", ms=20, colours=256, palette=None):
+        """Starts streaming the animation to a GIF file.
+
+        Following append_frame() calls quantize and write each frame on a
+        background thread instead of keeping it in memory.
+        Call save_gif() to finish the file.
+
+        `palette` is a list of colors or "global" to build one palette for
+        all frames from the first frames (see GifWriter).
+        """
+        self.set_sink(GifWriter(filename, ms, colours, palette))
+
+    def save_gif(self, filename="anim.gif", ms=20, colours=256, workers=None, processes=False,
+                 palette=None):
+        """Saves animation as GIF
+
+
+        - 100 MS = 10 FPS
+        - 50 MS = 20 FPS
+        - 33.33333 MS = 30 FPS
+        - 20 MS = 50 FPS
+
+        `workers` sets the number of threads used to quantize frames in parallel.
+        If `processes` is True, a process pool is used instead of threads.
+        Frame order and output are the same as the serial encoding.
+
+        `palette` switches to one shared palette for all frames:
+        a list of colors (e.g. the draw colors of the animation)
+        or "global" to build it from a sample of the frames.
+        Mapping to a fixed palette is faster than adaptive quantization
+        and the GIF stores a single global color table.
+
+        If a frame sink is set (e.g. by start_gif()), closes the sink
+        instead and the arguments are ignored.
+        """
+        frames = self.frames
+        if self.sink is not None:
+            self.close_sink()
+            return
+        if palette == "global":
+            palette = sample_palette(frames, colours)
+        elif palette is not None:
+            palette = make_palette(palette)
+        to_palette = partial(quantize, colours=colours, palette=palette)
+        if workers is None or workers <= 1:
+            frames[:] = map(to_palette, frames)
+        else:
+            pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+            with pool(workers) as executor:
+                chunksize = max(1, len(frames) // (workers * 4))
+                frames[:] = executor.map(to_palette, frames, chunksize=chunksize)
+        params = {} if palette is None else {"palette": palette.palette}
+        frames[0].save(filename, save_all=True,
+                       append_images=frames[1:], optimize=False,
+                       duration=ms, loop=0, **params)
@@ -4,6 +4,7 @@ from math import sqrt, cos, sin, acos, degrees, radians, log, pi
 import math
 from abc import ABC, abstractmethod
 from bisect import bisect
+from functools import lru_cache
 import re
 
 from pd.utils import quadratic_to_cubic, remove_doubles
@@ -12,7 +13,8 @@ COMMANDS = set("MmZzLlHhVvCcSsQqTtAa")
 UPPERCASE = set("MZLHVCSQTA")
 
 COMMAND_RE = re.compile(r"([MmZzLlHhVvCcSsQqTtAa])")
-FLOAT_RE = re.compile(rb"^[-+]?\d*\.?\d*(?:[eE][-+]?\d+)?")
+FLOAT_RE = re.compile(r"[-+]?[0-9]*\.?[0-9]*(?:[eE][-+]?[0-9]+)?")
+SEPARATOR_RE = re.compile(r"[ \t\r\n,]*")
 
 
 class InvalidPathError(ValueError):
@@ -38,55 +40,55 @@ ARGUMENT_SEQUENCE = {
 }
 
 
-def strip_array(arg_array):
-    """Strips whitespace and commas"""
-    # EBNF wsp:(#x20 | #x9 | #xD | #xA) + comma: 0x2C
-    while arg_array and arg_array[0] in (0x20, 0x9, 0xD, 0xA, 0x2C):
-        arg_array[0:1] = b""
+# Arguments are scanned by walking an index through the argument string.
+# Each scanner returns (value, position after the value and its separator),
+# so a d string is tokenized in a single linear pass.
+
 
+def skip_separators(args, pos):
+    """Skips whitespace and commas"""
+    # EBNF wsp:(#x20 | #x9 | #xD | #xA) + comma: 0x2C
+    return SEPARATOR_RE.match(args, pos).end()
 
-def pop_number(arg_array):
-    res = FLOAT_RE.search(arg_array)
-    if not res or not res.group():
-        raise InvalidPathError(f"Expected a number, got '{arg_array}'.")
-    number = float(res.group())
-    start = res.start()
-    end = res.end()
-    arg_array[start:end] = b""
-    strip_array(arg_array)
 
-    return number
+def scan_number(args, pos):
+    res = FLOAT_RE.match(args, pos)
+    if not res.group():
+        raise InvalidPathError(f"Expected a number, got '{args[pos:pos + 20]}'.")
+    return float(res.group()), skip_separators(args, res.end())
 
 
-def pop_unsigned_number(arg_array):
-    number = pop_number(arg_array)
+def scan_unsigned_number(args, pos):
+    number, pos = scan_number(args, pos)
     if number < 0:
         raise InvalidPathError(
             f"Expected a non-negative number, got '{number}'.")
-    return number
+    return number, pos
 
 
-def pop_coordinate_pair(arg_array):
-    x = pop_number(arg_array)
-    y = pop_number(arg_array)
-    return complex(x, y)
+def scan_coordinate_pair(args, pos):
+    x, pos = scan_number(args, pos)
+    y, pos = scan_number(args, pos)
+    return complex(x, y), pos
 
 
-def pop_flag(arg_array):
-    flag = arg_array[0]
-    arg_array[0:1] = b""
-    strip_array(arg_array)
-    if flag == 48:  # ASCII 0
-        return False
-    if flag == 49:  # ASCII 1
-        return True
+def scan_flag(args, pos):
+    if pos >= len(args):
+        raise InvalidPathError("Expected a flag, got end of path.")
+    flag = args[pos]
+    pos = skip_separators(args, pos + 1)
+    if flag == "0":
+        return False, pos
+    if flag == "1":
+        return True, pos
+    return None, pos
 
 
-FIELD_POPPERS = {
-    "u": pop_unsigned_number,
-    "s": pop_number,
-    "c": pop_coordinate_pair,
-    "f": pop_flag,
+FIELD_SCANNERS = {
+    "u": scan_unsigned_number,
+    "s": scan_number,
+    "c": scan_coordinate_pair,
+    "f": scan_flag,
 }
 
 
@@ -121,13 +123,14 @@ def _tokenize_path(pathdef):
         # For the rest of the commands, we parse the arguments and
         # yield one command per full set of arguments
         arg_sequence = ARGUMENT_SEQUENCE[command.upper()]
-        arguments = bytearray(args, "ascii")
+        pos, end = 0, len(args)
         implicit = False
-        while arguments:
+        while pos < end:
             command_arguments = []
             for i, arg in enumerate(arg_sequence):
                 try:
-                    command_arguments.append(FIELD_POPPERS[arg](arguments))
+                    value, pos = FIELD_SCANNERS[arg](args, pos)
+                    command_arguments.append(value)
                 except InvalidPathError as e:
                     if i == 0 and implicit:
                         return  # Invalid character in path, treat like a comment
@@ -145,9 +148,46 @@ def _tokenize_path(pathdef):
                 command = "L"
 
 
-def parse_path(pathdef):
-    from pd.path import CBezier
+def parse_path(pathdef, tolerance=None):
+    """Returns flattened xy coordinates of SVG path d string.
+
+    Curves are flattened with 50 samples each, or adaptively
+    within `tolerance` pixels if given.
+    Subpaths are joined into one list (see parse_compound_path()).
+    Results are cached (see cached_parse_path()); a new list is returned."""
+    return list(cached_parse_path(pathdef, tolerance)[0])
+
+
+def parse_compound_path(pathdef, tolerance=None):
+    """Returns flattened xy coordinates and subpaths of SVG path d string.
+
+    Subpaths is a tuple of (start point index, closed) pairs, one for each
+    subpath (M command), or None if the d string has a single subpath."""
+    coords, subpaths = cached_parse_path(pathdef, tolerance)
+    return list(coords), subpaths
+
+
+@lru_cache(maxsize=512)
+def cached_parse_path(pathdef, tolerance=None):
+    """Returns flattened xy coordinates and subpaths of SVG path d string
+    (see parse_compound_path()) from a bounded LRU cache keyed on the
+    d string and flattening settings.
+
+    The returned list is shared by every caller and must not be modified.
+    Path copies it on first write (copy-on-write)."""
+    return _parse_path(pathdef, tolerance)
+
+
+def clear_path_cache():
+    """Empties the parsed path cache"""
+    cached_parse_path.cache_clear()
+
+
+def _parse_path(pathdef, tolerance=None):
+    from pd.path import CBezier, flatten_beziers
     segments = []
+    # [first segment index, closed] of each subpath
+    subpaths = []
     start_pos = None
     last_command = None
     current_pos = 0
@@ -156,6 +196,9 @@ def parse_path(pathdef):
         command = token[0]
         relative = command.islower()
         command = command.upper()
+        if last_command == "Z" and command not in "MZ":
+            # drawing after Z starts a new subpath at the same start point
+            subpaths.append([len(segments), False])
         if command == "M":
             pos = token[1]
             if relative:
@@ -164,12 +207,14 @@ def parse_path(pathdef):
                 current_pos = pos
             # segments.append(Move(current_pos, relative=relative))
             start_pos = current_pos
+            subpaths.append([len(segments), False])
 
         elif command == "Z":
             # For Close commands the "relative" argument just preserves case,
             # it has no different in behavior.
             # segments.append(Close(current_pos, start_pos, relative=relative))
             current_pos = start_pos
+            subpaths[-1][1] = True
 
         elif command == "L":
             pos = token[1]
@@ -300,14 +345,27 @@ def parse_path(pathdef):
 
         # Finish up the loop in preparation for next command
         last_command = command
-    cords = []
-    for seg in segments:
-        if isinstance(seg, CBezier):
-            cords.extend(seg.flatten())
-        if isinstance(seg, SVG_Line):
-            cords.extend(seg.flatten())
-    cords = remove_doubles(cords)
-    return cords
+    curves = [seg for seg in segments if isinstance(seg, CBezier)]
+    flattened = iter(flatten_beziers(curves, tolerance=tolerance))
+    ends = [first for first, _ in subpaths[1:]] + [len(segments)]
+    cords, starts = [], []
+    for (first, closed), end in zip(subpaths, ends):
+        if first == end:
+            continue
+        subpath = []
+        for seg in segments[first:end]:
+            if isinstance(seg, CBezier):
+                subpath.extend(next(flattened))
+            if isinstance(seg, SVG_Line):
+                subpath.extend(seg.flatten())
+            if isinstance(seg, Arc):
+                subpath.extend(seg.flatten(
+                    ARC_TOLERANCE if tolerance is None else tolerance))
+        starts.append((len(cords) // 2, closed))
+        cords.extend(remove_doubles(subpath))
+    if len(starts) < 2:
+        return cords, None
+    return cords, tuple(starts)
     # return segments
 
 
@@ -374,3 +432,114 @@ class SVG_Line():
 
     def flatten(self):
         return [self.start.real, self.start.imag, self.end.real, self.end.imag]
+
+
+# Default max distance (in pixels) between an arc and its flattened chords
+ARC_TOLERANCE = 0.1
+
+
+class Arc():
+    def __init__(self, start, radius, rotation, arc, sweep, end, relative=False):
+        """SVG elliptical arc segment
+
+        radius is complex (rx + ry * 1j) and rotation is in degrees."""
+        self.start = start
+        self.radius = radius
+        self.rotation = rotation
+        self.arc = arc
+        self.sweep = sweep
+        self.end = end
+        self._parameterize()
+
+    def _parameterize(self):
+        # Conversion from endpoint to center parameterization
+        # http://www.w3.org/TR/SVG/implnote.html#ArcImplementationNotes
+        self.radius_scale, self.center, self.theta, self.delta = 1, None, 0.0, 0.0
+        if self.start == self.end or self.radius.real == 0 or self.radius.imag == 0:
+            # omitted segment or straight line
+            return
+
+        cosr = cos(radians(self.rotation))
+        sinr = sin(radians(self.rotation))
+        dx = (self.start.real - self.end.real) / 2
+        dy = (self.start.imag - self.end.imag) / 2
+        x1prim = cosr * dx + sinr * dy
+        y1prim = -sinr * dx + cosr * dy
+
+        rx, ry = abs(self.radius.real), abs(self.radius.imag)
+        # Correct out of range radii (scale up only)
+        radius_scale = (x1prim * x1prim) / (rx * rx) + (y1prim * y1prim) / (ry * ry)
+        if radius_scale > 1:
+            self.radius_scale = sqrt(radius_scale)
+            rx *= self.radius_scale
+            ry *= self.radius_scale
+
+        t1 = rx * rx * y1prim * y1prim
+        t2 = ry * ry * x1prim * x1prim
+        c = sqrt(abs((rx * rx * ry * ry - t1 - t2) / (t1 + t2)))
+        if self.arc == self.sweep:
+            c = -c
+        cxprim = c * rx * y1prim / ry
+        cyprim = -c * ry * x1prim / rx
+
+        self.center = complex(
+            (cosr * cxprim - sinr * cyprim) +
+            ((self.start.real + self.end.real) / 2),
+            (sinr * cxprim + cosr * cyprim) +
+            ((self.start.imag + self.end.imag) / 2),
+        )
+
+        ux = (x1prim - cxprim) / rx
+        uy = (y1prim - cyprim) / ry
+        vx = (-x1prim - cxprim) / rx
+        vy = (-y1prim - cyprim) / ry
+        self.theta = math.atan2(uy, ux) % (2 * pi)
+        delta = (math.atan2(vy, vx) - math.atan2(uy, ux)) % (2 * pi)
+        if not self.sweep:
+            delta -= 2 * pi
+        self.delta = delta
+
+    @property
+    def radii(self) -> tuple:
+        """Returns (rx, ry) after out of range correction"""
+        return (abs(self.radius.real) * self.radius_scale,
+                abs(self.radius.imag) * self.radius_scale)
+
+    def point(self, t: float) -> tuple:
+        """Returns the point at time t in range 0~1"""
+        if self.center is None:
+            pos = self.start + (self.end - self.start) * t
+            return (pos.real, pos.imag)
+        angle = self.theta + self.delta * t
+        cosr = cos(radians(self.rotation))
+        sinr = sin(radians(self.rotation))
+        rx, ry = self.radii
+        x = cosr * cos(angle) * rx - sinr * sin(angle) * ry + self.center.real
+        y = sinr * cos(angle) * rx + cosr * sin(angle) * ry + self.center.imag
+        return (x, y)
+
+    def samples_for_tolerance(self, tolerance: float) -> int:
+        """Returns the number of samples that keeps the chords within
+        `tolerance` pixels of the arc.
+
+        A chord spanning angle a on radius r deviates r * (1 - cos(a / 2))
+        from the arc, so the angle step follows from the larger radius and
+        the segment count from the sweep angle."""
+        if self.center is None:
+            return 2
+        r = max(self.radii)
+        step = 2 * acos(1 - min(1.0, tolerance / r))
+        return max(2, math.ceil(abs(self.delta) / step) + 1)
+
+    def flatten(self, tolerance: float = ARC_TOLERANCE) -> list[float]:
+        """Returns the flattened coordinates."""
+        if self.start == self.end:
+            return []
+        samples = self.samples_for_tolerance(tolerance)
+        coords = []
+        for i in range(samples):
+            coords.extend(self.point(i / (samples - 1)))
+        # exact end points
+        coords[:2] = self.start.real, self.start.imag
+        coords[-2:] = self.end.real, self.end.imag
+        return coords
@@ -0,0 +1,108 @@
+from PIL import Image, ImageColor, GifImagePlugin
+from pd.sinks import FrameSink
+
+
+def _rgb(color) -> tuple:
+    if isinstance(color, str):
+        return ImageColor.getrgb(color)[:3]
+    if isinstance(color, int):
+        return (color, color, color)
+    return tuple(color[:3])
+
+
+def make_palette(colors: list) -> Image.Image:
+    """Returns palette image from a list of colors.
+
+    Colors can be names ("deepskyblue"), hex strings ("#181818"),
+    RGB(A) tuples or gray values (80) as used by the draw functions."""
+    if not 0 < len(colors) <= 256:
+        raise ValueError("Palette must have 1 to 256 colors.")
+    palette = Image.new("P", (1, 1))
+    palette.putpalette([c for color in colors for c in _rgb(color)])
+    return palette
+
+
+def sample_palette(frames: list[Image.Image], colours=256, samples=16) -> Image.Image:
+    """Returns adaptive palette image built from evenly spaced sample frames"""
+    sample = frames[::max(1, len(frames) // samples)][:samples]
+    w, h = sample[0].size
+    sheet = Image.new("RGB", (w, h * len(sample)))
+    for i, frame in enumerate(sample):
+        sheet.paste(frame.convert("RGB"), (0, h * i))
+    return sheet.quantize(colours, dither=Image.Dither.NONE)
+
+
+def quantize(frame: Image.Image, colours=256, palette: Image.Image = None) -> Image.Image:
+    """Converts frame to palette mode.
+
+    Without `palette` every frame gets its own adaptive palette.
+    Otherwise the frame is mapped to the colors of the palette image."""
+    if palette is None:
+        return frame.convert(mode="P",
+                             dither=False, palette=Image.ADAPTIVE,
+                             colors=colours)
+    return frame.convert("RGB").quantize(palette=palette, dither=Image.Dither.NONE)
+
+
+class GifWriter(FrameSink):
+
+    def __init__(self, filename="anim.gif", ms=20, colours=256, palette=None, queue_size=8,
+                 palette_frames=16):
+        """Streams animation frames to a GIF file.
+
+        Each appended frame is quantized and written to the file by a
+        background thread, so encoding overlaps with rendering and memory
+        does not grow with the frame count. At most `queue_size` frames
+        wait for encoding; append() blocks when the queue is full.
+
+        `palette` is a list of colors (see make_palette()) or "global"
+        to build an adaptive palette from the first `palette_frames` frames
+        (see sample_palette()). These frames are held back until the palette
+        is built. All frames then share one global color table.
+        """
+        self.filename = filename
+        self.ms = ms
+        self.colours = colours
+        self.palette = make_palette(palette) if isinstance(palette, list) else palette
+        self.palette_frames = palette_frames
+        self._pending = []
+        self._written = 0
+        self._file = open(filename, "wb")
+        super().__init__(queue_size)
+
+    def write(self, frame: Image.Image):
+        if self.palette == "global":
+            self._pending.append(frame)
+            if len(self._pending) >= self.palette_frames:
+                self._write_pending()
+        else:
+            self._write(frame)
+
+    def _write_pending(self):
+        self.palette = sample_palette(self._pending, self.colours)
+        frames, self._pending = self._pending, []
+        for frame in frames:
+            self._write(frame)
+
+    def _write(self, frame: Image.Image):
+        frame = quantize(frame, self.colours, self.palette)
+        if self._written == 0:
+            header, _ = GifImagePlugin.getheader(
+                frame, info={"loop": 0, "duration": self.ms})
+            self._file.write(b"".join(header))
+        # the first frame uses the global color table
+        local_table = self._written > 0 and self.palette is None
+        for data in GifImagePlugin.getdata(frame, duration=self.ms,
+                                           include_color_table=local_table):
+            self._file.write(data)
+        self._written += 1
+
+    def finish(self):
+        try:
+            if self._error is None:
+                if self._pending:
+                    self._write_pending()
+                self._file.write(b";")
+        finally:
+            self._pending = []
+            self._file.close()
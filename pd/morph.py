@@ -0,0 +1,77 @@
+from pd import singleton
+from pd.path import Path
+from pd.tween import get_easing
+from pd.utils import np, require_numpy
+
+
+def _align(source, target, closed: bool):
+    # Returns target points reordered so that the total squared travel from
+    # the source points is smallest. Closed paths try every start point in
+    # both directions, open paths only the two directions.
+    candidates = [target, target[::-1]]
+    if not closed:
+        costs = [((source - c) ** 2).sum() for c in candidates]
+        return candidates[int(np.argmin(costs))]
+    a, best, best_cost = source[:-1], None, None
+    for c in candidates:
+        b = c[:-1]
+        # cyclic cross-correlation of a with every shift of b, with FFT
+        corr = np.fft.ifft(np.fft.fft(a, axis=0).conj() * np.fft.fft(b, axis=0), axis=0).real.sum(axis=1)
+        shift = int(np.argmax(corr))
+        cost = (a ** 2).sum() + (b ** 2).sum() - 2 * corr[shift]
+        if best_cost is None or cost < best_cost:
+            best, best_cost = np.roll(b, -shift, axis=0), cost
+    return np.vstack((best, best[:1]))
+
+
+class Morph():
+
+    def __init__(self, source: Path, target: Path, samples: int = None, easing=None):
+        """Precomputed morph between two Paths. (requires numpy)
+
+        Both paths are resampled by arc length to the same number of points
+        (`samples`, default: at least 100 and the point count of the paths),
+        and the target points are aligned to the source so the points travel
+        as little as possible (start point and direction for closed paths).
+        Each frame is then one vectorized blend into a reused buffer.
+
+        `easing` is an Easings member, its name or an easing function of t.
+
+        morph = Morph(regular_polygon((125, 125), 5, 80), star((125, 125), 80),
+                      easing=Easings.EASE_IN_OUT_SINE)
+        for t in linspace(0, 1, 60):
+            clear()
+            morph.draw(t, "white", None)
+            append_frame()
+        """
+        require_numpy("Morph")
+        if samples is None:
+            samples = max(100, int(source.points), int(target.points))
+        self.closed = source.is_closed() and target.is_closed()
+        a = np.array(source.clone().resample(samples).coords, dtype=float).reshape(-1, 2)
+        b = np.array(target.clone().resample(samples).coords, dtype=float).reshape(-1, 2)
+        b = _align(a, b, self.closed)
+        self.source = a.reshape(-1)
+        self.delta = b.reshape(-1) - self.source
+        self.buffer = np.empty_like(self.source)
+        self.easing = None if easing is None else easing if callable(easing) else get_easing(easing)
+
+    def coords_at(self, t: float):
+        """Returns the morphed coordinates at time t in range 0~1.
+
+        The result is written into `buffer` (flat array), which is
+        overwritten by the next call. Copy it to keep it."""
+        if self.easing is not None:
+            t = self.easing(t)
+        np.multiply(self.delta, t, out=self.buffer)
+        self.buffer += self.source
+        return self.buffer
+
+    def path_at(self, t: float) -> Path:
+        """Returns the morphed shape at time t as new NumPy-backed Path"""
+        return Path(self.coords_at(t).copy())
+
+    def draw(self, t: float, fill="#181818", stroke="grey", thickness=1.5):
+        """Draws the morphed shape at time t without creating a Path"""
+        singleton.draw_path(self.coords_at(t).tolist(), fill, stroke, thickness, self.closed)
+        return self
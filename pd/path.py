@@ -1,10 +1,11 @@
-from copy import deepcopy
+from functools import lru_cache
 from typing import Self
 from pd import singleton, tween
-from pd._d_parser import parse_path
+from pd._d_parser import cached_parse_path
 from pd.tween import Easings
-from pd.utils import (get_pos, linspace, calculate_length,
-                      is_points_close, rotate, scale, translate, tuples2list,
+from pd.utils import (np, is_array, require_numpy, get_pos_at, get_positions, linspace, cumulative_lengths, segment_index,
+                      is_points_close, transform, multiply_matrix, translation_matrix,
+                      rotation_matrix, scale_matrix, tuples2list,
                       list2tuples, centroid, bbox, shift,
                       point_on_circle, opposite_angle)
 import math
@@ -12,111 +13,240 @@ import math
 
 class Path():
 
-    def __init__(self, coordinates: list[float] | list[tuple] | str, close=False):
+    def __init__(self, coordinates: list[float] | list[tuple] | str, close=False, tolerance: float = None):
         """Creates new Path with a list of coordinates or SVG d string
 
-        (A) Arc for SVG string is not supported.
+        `tolerance` flattens the curves of a d string adaptively
+        (see CBezier.flatten()) instead of using 50 samples per curve.
+        Elliptical arcs (A) are always flattened by chord tolerance
+        (0.1 pixels by default).
+
+        A numpy array (flat or (N, 2)) creates a NumPy-backed Path.
+        Transforms, bounds, centroid and length then run as vectorized operations.
+
+        A d string with several subpaths (M commands) creates a compound
+        Path (see subpaths).
         """
         self.coords = []
+        if is_array(coordinates):
+            self.coords = coordinates.astype(float, copy=False).reshape(-1)
         if isinstance(coordinates, str):
-            self.coords = parse_path(coordinates)
+            # shared with the parse cache until the Path is modified
+            self.coords, self._subpaths = cached_parse_path(coordinates, tolerance)
+            self._shared = True
         if isinstance(coordinates, list):
             self.coords = coordinates
         if isinstance(coordinates[0], tuple):
             self.coords = tuples2list(coordinates)
-        self.length = calculate_length(self.coords)
         self.anchor = self.centroid
 
+    @property
+    def coords(self) -> list[float]:
+        """Flat xy coordinate list. (flat float array for NumPy-backed Paths)
+
+        The list may be modified in place, so reading it drops the cached
+        segment lengths and detaches it from clones sharing it."""
+        self._cumlen = None
+        return self._own()
+
+    @coords.setter
+    def coords(self, coordinates: list[float]):
+        # new coordinates make a single subpath
+        self._coords = coordinates
+        self._cumlen = None
+        self._subpaths = None
+
+    @property
+    def subpaths(self) -> tuple[tuple[int, bool]] | None:
+        """(start point index, closed) pairs of a compound Path, or None.
+
+        A compound Path keeps several subpaths in one coordinate list.
+        It is drawn with one draw call without joining the subpaths, and the
+        jumps between them have zero length (length, point_and_angle ...).
+        resample(), repeated() and set_start() join the subpaths."""
+        return self._subpaths
+
+    @property
+    def _coords(self):
+        # Storage with the pending transform matrix applied.
+        if self._matrix is not None:
+            if self._shared:
+                self._xy = self._xy.copy()
+                self._shared = False
+            transform(self._xy, self._matrix)
+            self._matrix = None
+        return self._xy
+
+    @_coords.setter
+    def _coords(self, coordinates):
+        # an array view of a buffer shared with clones (e.g. the slice in
+        # open()) is still shared
+        self._shared = (getattr(self, "_shared", False) and is_array(coordinates)
+                        and np.shares_memory(coordinates, self._xy))
+        self._xy = coordinates
+        self._matrix = None
+
+    def _own(self):
+        # Copy-on-write: clones share the coordinate buffer until one of
+        # them modifies it in place.
+        coords = self._coords
+        if self._shared:
+            self._coords = coords = coords.copy()
+        return coords
+
+    def transform(self, matrix: tuple):
+        """Applies 2D affine matrix (a, b, c, d, e, f) to the Path.
+
+        Transforms are not applied immediately. They are composed into a pending
+        matrix and applied to the coordinates once, when they are needed
+        (drawing, length, bounds, point_and_angle, coords ...)."""
+        self._transform(matrix)
+        self._cumlen = None
+        a, b, c, d, e, f = matrix
+        x, y = self.anchor
+        self.anchor = (a * x + c * y + e, b * x + d * y + f)
+        return self
+
+    def _transform(self, matrix: tuple):
+        if self._matrix is None:
+            self._matrix = matrix
+        else:
+            self._matrix = multiply_matrix(matrix, self._matrix)
+
+    @property
+    def cumulative_lengths(self) -> list[float]:
+        """Returns the path length up to each point.
+
+        The table is built on first use and kept until the path changes shape.
+        Translating and rotating keep it valid."""
+        if self._cumlen is None:
+            self._cumlen = cumulative_lengths(self._coords, self._subpaths)
+        return self._cumlen
+
+    @property
+    def array(self):
+        """Returns the coordinates as (N, 2) numpy array view.
+
+        Converts the Path to NumPy-backed storage first."""
+        self.to_numpy()
+        self._cumlen = None
+        return self._own().reshape(-1, 2)
+
+    def to_numpy(self):
+        """Switches the Path to NumPy-backed coordinate storage"""
+        require_numpy("NumPy-backed Path")
+        if not is_array(self._coords):
+            self._coords = np.array(self._coords, dtype=float)
+        return self
+
+    def to_list(self):
+        """Switches the Path to plain list coordinate storage"""
+        if is_array(self._coords):
+            self._coords = self._coords.tolist()
+        return self
+
+    @property
+    def length(self) -> float:
+        """Returns total length of the path"""
+        return self.cumulative_lengths[-1]
+
     def set_anchor(self, pos: tuple):
         self.anchor = pos
         return self
 
     def is_closed(self) -> bool:
         """Checks if the Path is closed."""
-        x1, y1 = self.coords[:2]
-        x2, y2 = self.coords[-2:]
+        x1, y1 = self._coords[:2]
+        x2, y2 = self._coords[-2:]
         return math.isclose(x1, x2) and math.isclose(y1, y2)
 
     def close(self):
         """Closes the path"""
         if self.is_closed() == False:
-            self.coords.extend((self.coords[0], self.coords[1]))
-            self.length = calculate_length(self.coords)
+            if is_array(self._coords):
+                self._coords = np.append(self._coords, self._coords[:2])
+            else:
+                self._own().extend((self._coords[0], self._coords[1]))
+            self._cumlen = None
         return self
 
     def open(self):
         """Opens the path"""
         if self.is_closed():
-            self.coords = self.coords[:-2]
-            self.length = calculate_length(self.coords)
+            self._coords = self._coords[:-2]
+            self._cumlen = None
         return self
 
     def clone(self):
-        """Returns copy of Path"""
-        cp = deepcopy(self)
+        """Returns copy of Path
+
+        The copy shares the coordinate buffer with the original until
+        one of them is modified (copy-on-write), so cloning is O(1)."""
+        cp = type(self).__new__(type(self))
+        cp.__dict__.update(self.__dict__)
+        self._shared = cp._shared = True
         return cp
 
     @property
     def segs(self):
         """Returns number of segments"""
-        return (len(self.coords) / 2) - 1
+        return (len(self._coords) / 2) - 1
 
     @property
     def start(self) -> tuple:
         """Returns start point"""
-        return (self.coords[0], self.coords[1])
+        return (self._coords[0], self._coords[1])
 
     @property
     def end(self) -> tuple:
         """Returns end point"""
-        return (self.coords[-2], self.coords[-1])
+        return (self._coords[-2], self._coords[-1])
 
     @property
     def points(self):
         """Returns number of points"""
-        return (len(self.coords) / 2)
+        return (len(self._coords) / 2)
 
     def repeated(self, n):
         """Returns new repeated version of path n times
 
         Useful for creating motion path loops.
         """
-        clone = deepcopy(self)
+        clone = self.clone()
         clone.open()
-        clone.coords = clone.coords * n
+        if is_array(clone._coords):
+            clone.coords = np.tile(clone._coords, n)
+        else:
+            clone.coords = clone._coords * n
         clone.close()
         return clone
 
     def set_start(self, index):
         """Sets start point of path. (shift coordinates)"""
         self.open()
-        self.coords = shift(self.coords, index * 2)
+        self.coords = shift(self._coords, index * 2)
         self.close()
-        self.length = calculate_length(self.coords)
 
     def as_tuples(self, round_coords=False) -> list[tuple]:
         """Returns path coords as tuple list"""
-        return list2tuples(self.coords, round_coords=round_coords)
+        return list2tuples(self._coords, round_coords=round_coords)
 
     @property
     def centroid(self) -> tuple:
         """Calculates and returns path centroid"""
         if self.is_closed() == False:
-            return centroid(self.coords)
+            return centroid(self._coords)
         else:
-            self.open()
-            point = centroid(self.coords)
-            self.close()
-            return point
+            return centroid(self._coords[:-2])
 
     @property
     def bounds(self) -> list[tuple]:
         """Returns top-left and bottom-right bounding box coordinates as list. [p1, p2]"""
-        return bbox(self.coords)
+        return bbox(self._coords)
 
     def translate(self, x, y):
         """Translates Path"""
-        translate(self.coords, x, y)
+        self._transform(translation_matrix(x, y))
         self.anchor = (self.anchor[0] + x, self.anchor[1] + y)
         return self
 
@@ -129,7 +259,7 @@ class Path():
 
         if anchor_point == None:
             anchor_point = self.anchor
-        rotate(self.coords, angle, anchor_point)
+        self._transform(rotation_matrix(angle, anchor_point))
         return self
 
     def scale(self, x, y, anchor_point: tuple = None):
@@ -139,26 +269,26 @@ class Path():
 
         if anchor_point == None:
             anchor_point = self.anchor
-        scale(self.coords, x, y, anchor_point)
-        self.length = calculate_length(self.coords)
+        self._transform(scale_matrix(x, y, anchor_point))
+        self._cumlen = None
         return self
 
     def translated(self, x, y):
         """Returns new translated Path"""
-        cp = deepcopy(self)
+        cp = self.clone()
         cp.translate(x, y)
         return cp
 
     def rotated(self, angle, anchor_point: tuple = None):
         """Returns a new Path rotated around the anchor point."""
-        cp = deepcopy(self)
+        cp = self.clone()
         if anchor_point == None:
             anchor_point = cp.anchor
         return cp.rotate(angle, anchor_point)
 
     def scaled(self, x, y, anchor_point: tuple = None):
         """Returns new scaled Path"""
-        cp = deepcopy(self)
+        cp = self.clone()
         return cp.scale(x, y, anchor_point)
 
     def set_pos(self, pos: tuple) -> Self:
@@ -174,9 +304,19 @@ class Path():
 
         The starting point becomes the end and the end becomes the beginning.
         """
-        self.coords.reverse()
-        for i in range(0, len(self.coords), 2):
-            self.coords[i], self.coords[i+1] = self.coords[i+1], self.coords[i]
+        if is_array(self._coords):
+            self._coords = self._coords.reshape(-1, 2)[::-1].reshape(-1)
+        else:
+            coords = self._own()
+            coords.reverse()
+            for i in range(0, len(coords), 2):
+                coords[i], coords[i+1] = coords[i+1], coords[i]
+        if self._subpaths:
+            n = len(self._coords) // 2
+            ends = [start for start, _ in self._subpaths[1:]] + [n]
+            self._subpaths = tuple((n - end, closed) for (_, closed), end
+                                   in zip(reversed(self._subpaths), reversed(ends)))
+        self._cumlen = None
         return self
 
     def add_point(self, t):
@@ -188,37 +328,51 @@ class Path():
         if t == 1 or t == 0:
             return
 
-        target_length = t * self.length
-        total_length = 0.0
-        for i in range(0, len(self.coords) - 2, 2):
-            x1, y1 = self.coords[i], self.coords[i + 1]
-            x2, y2 = self.coords[i + 2], self.coords[i + 3]
-            segment_length = math.hypot(x2 - x1, y2 - y1)
-            if total_length + segment_length >= target_length:
-                frac_seg = (target_length - total_length) / segment_length
-                point_x = x1 + (x2 - x1) * frac_seg
-                point_y = y1 + (y2 - y1) * frac_seg
-                if is_points_close((x2, y2), (point_x, point_y)) == False:
-                    self.coords.insert(i + 2, point_y)
-                    self.coords.insert(i + 2, point_x)
-                    self.length = calculate_length(self.coords)
-                return
-            total_length += segment_length
+        cumlen = self.cumulative_lengths
+        target_length = t * cumlen[-1]
+        i = segment_index(cumlen, target_length)
+        x1, y1 = self._coords[i * 2 - 2], self._coords[i * 2 - 1]
+        x2, y2 = self._coords[i * 2], self._coords[i * 2 + 1]
+        frac_seg = (target_length - cumlen[i - 1]) / (cumlen[i] - cumlen[i - 1])
+        point_x = x1 + (x2 - x1) * frac_seg
+        point_y = y1 + (y2 - y1) * frac_seg
+        if is_points_close((x2, y2), (point_x, point_y)) == False:
+            if is_array(self._coords):
+                self._coords = np.insert(self._coords, i * 2, (point_x, point_y))
+            else:
+                self._own()[i * 2:i * 2] = (point_x, point_y)
+            self._cumlen = cumlen[:i] + [target_length] + cumlen[i:]
+            if self._subpaths:
+                self._subpaths = tuple((start + (start >= i), closed)
+                                       for start, closed in self._subpaths)
 
     def point_and_angle(self, t) -> tuple[tuple, float]:
         """Returns point and tangent angle at time t (in range 0~1)"""
 
         if t == 1:
-            angle = math.atan2(self.coords[-1] - self.coords[-3],
-                               self.coords[-2] - self.coords[-4])
-            return ([self.coords[-2], self.coords[-1]],  angle)
+            angle = math.atan2(self._coords[-1] - self._coords[-3],
+                               self._coords[-2] - self._coords[-4])
+            return ([self._coords[-2], self._coords[-1]],  angle)
         if t == 0:
-            angle = math.atan2(self.coords[3] - self.coords[1],
-                               self.coords[2] - self.coords[0])
-            return ([self.coords[0], self.coords[1]],  angle)
-
-        target_length = t * self.length
-        return get_pos(self.coords, target_length)
+            angle = math.atan2(self._coords[3] - self._coords[1],
+                               self._coords[2] - self._coords[0])
+            return ([self._coords[0], self._coords[1]],  angle)
+
+        cumlen = self.cumulative_lengths
+        return get_pos_at(self._coords, cumlen, t * cumlen[-1])
+
+    def points_and_angles(self, ts) -> list[tuple[list, float]]:
+        """Returns points and tangent angles for many t values (in range 0~1).
+
+        Same as calling point_and_angle() for each t, but all values are
+        found in one sweep over the segments."""
+        cumlen = self.cumulative_lengths
+        total = cumlen[-1]
+        result = get_positions(self._coords, cumlen, [t * total for t in ts])
+        for j, t in enumerate(ts):
+            if t == 1:
+                result[j] = self.point_and_angle(t)
+        return result
 
     def offset(self, t: float, lenght: float) -> tuple[tuple, tuple]:
         """Returns the outer and inner parallel points of the given length in time on the path."""
@@ -228,27 +382,77 @@ class Path():
         p2 = point_on_circle(pos, lenght, opposite_angle(ang))
         return (p1, p2)
 
+    def offsets(self, ts, lenght: float) -> list[tuple[tuple, tuple]]:
+        """Returns offset() pairs for many t values in one pass."""
+        pairs = []
+        for pos, ang in self.points_and_angles(ts):
+            ang += math.pi * 0.5
+            pairs.append((point_on_circle(pos, lenght, ang),
+                          point_on_circle(pos, lenght, opposite_angle(ang))))
+        return pairs
+
     def resample(self, n):
-        """Resamples the points on the path n times"""
+        """Resamples the points on the path n times
+
+        The subpaths of a compound Path are joined."""
         cords = []
-        for i in linspace(0, 1, n):
-            cords.extend(self.point_and_angle(i)[0])
-        self.coords = cords
-        self.length = calculate_length(self.coords)
+        for point, _ in self.points_and_angles(linspace(0, 1, n)):
+            cords.extend(point)
+        self.coords = np.array(cords) if is_array(self._coords) else cords
         return self
 
     def draw(self, fill="#181818", stroke="grey", thickness=1.5):
         """Draws the path on the canvas."""
-        singleton.draw_path(self.coords, fill, stroke,
-                            thickness, self.is_closed())
+        singleton.draw_path(self._coords, fill, stroke,
+                            thickness, self.is_closed(), self._subpaths)
+        return self
+
+    def draw_instances(self, transforms, fill="#181818", stroke="grey", thickness=1.5):
+        """Draws copies of the path with (x, y, angle, scale) transforms.
+
+        Each copy is scaled and rotated around the anchor point, which is
+        placed at (x, y), like set_pos(), rotate() and scale() on a clone.
+        `transforms` is a list of tuples or an (n, 4) array. The copies are
+        computed into one scratch buffer (all at once with numpy) and drawn
+        with one pen and brush, without creating Path objects.
+
+        arrow.draw_instances([(x, y, angle, 1) for x, y, angle in particles])
+        """
+        singleton.draw_paths(self._instances(transforms), fill, stroke, thickness,
+                             self.is_closed(), self._subpaths)
         return self
 
+    def _instances(self, transforms):
+        ax, ay = self.anchor
+        if np is not None:
+            transforms = np.asarray(transforms, dtype=float).reshape(-1, 4)
+            rel = np.asarray(self._coords, dtype=float).reshape(-1, 2) - (ax, ay)
+            x, y, angle, scale = transforms.T[:, :, None]
+            cos, sin = np.cos(angle) * scale, np.sin(angle) * scale
+            scratch = np.empty((len(transforms), len(rel), 2))
+            scratch[..., 0] = x + cos * rel[:, 0] - sin * rel[:, 1]
+            scratch[..., 1] = y + sin * rel[:, 0] + cos * rel[:, 1]
+            yield from scratch.reshape(len(transforms), -1).tolist()
+            return
+        coords = self._coords
+        rel = [c - ax if i % 2 == 0 else c - ay for i, c in enumerate(coords)]
+        scratch = [0.0] * len(rel)
+        for x, y, angle, scale in transforms:
+            cos, sin = math.cos(angle) * scale, math.sin(angle) * scale
+            for i in range(0, len(rel), 2):
+                dx, dy = rel[i], rel[i + 1]
+                scratch[i] = x + cos * dx - sin * dy
+                scratch[i + 1] = y + sin * dx + cos * dy
+            # the drawing backend copies the coordinates, so the buffer is reused
+            yield scratch
+
     def draw_debug(self, radius=3, fill=80, stroke="white", thickness=1.5):
         """Draws path features as colored dots. It is for debugging purposes.
 
         The starting point is blue. The second point is green and helps find the direction of the path.
         """
-        singleton.draw_path(self.coords, fill, stroke, thickness)
+        singleton.draw_path(self._coords, fill, stroke, thickness,
+                            subpaths=self._subpaths)
         points = self.as_tuples()
         for i, p in enumerate(points):
             if i != 0 or 1:
@@ -262,7 +466,7 @@ class Path():
         "Prints path info and coordinates"
         anchor_ = "anchor: " + str(self.anchor)
         closed_, points_ = str(self.is_closed()), str(
-            int(len(self.coords) / 2))
+            int(len(self._coords) / 2))
         if lines:
             print("closed:", closed_, "| ", "points:", points_, "| ", anchor_)
             for p in self.as_tuples(round_coords=round_coords):
@@ -287,9 +491,83 @@ class CBezier():
             1 - t) * t * self.points[1][1] + 3 * (1 - t) * t * t * self.points[2][1] + t * t * t * self.points[3][1]
         return (x, y)
 
-    def flatten(self, samples=50) -> list[float]:
-        """Returns the flattened coordinates."""
-        coords = []
-        for t in linspace(0, 1, samples):
-            coords.extend(self.point(t))
+    def samples_for_tolerance(self, tolerance: float) -> int:
+        """Returns the number of samples that keeps the flattened curve
+        within `tolerance` pixels of the true curve.
+
+        The segment count is estimated from the deviation of the control
+        points from a straight line (second differences), so short or flat
+        curves get few points and long, strongly bent curves get many."""
+        (x0, y0), (x1, y1), (x2, y2), (x3, y3) = self.points
+        deviation = max(math.hypot(x0 - 2 * x1 + x2, y0 - 2 * y1 + y2),
+                        math.hypot(x1 - 2 * x2 + x3, y1 - 2 * y2 + y3))
+        return max(2, math.ceil(math.sqrt(0.75 * deviation / tolerance)) + 1)
+
+    def flatten(self, samples=50, tolerance: float = None) -> list[float]:
+        """Returns the flattened coordinates.
+
+        If `tolerance` (max distance in pixels from the curve) is given,
+        the sample count is chosen with samples_for_tolerance().
+        Points are evaluated with forward differencing (three additions
+        per coordinate instead of the full Bernstein polynomial)."""
+        if tolerance is not None:
+            samples = self.samples_for_tolerance(tolerance)
+        if samples < 2:
+            return [c for t in linspace(0, 1, samples) for c in self.point(t)]
+        (x0, y0), (x1, y1), (x2, y2), (x3, y3) = self.points
+        h = 1 / (samples - 1)
+        h2, h3 = h * h, h * h * h
+        # polynomial form: P(t) = a t^3 + b t^2 + c t + P0
+        ax, ay = x3 - x0 + 3 * (x1 - x2), y3 - y0 + 3 * (y1 - y2)
+        bx, by = 3 * (x0 - 2 * x1 + x2), 3 * (y0 - 2 * y1 + y2)
+        cx, cy = 3 * (x1 - x0), 3 * (y1 - y0)
+        dx, dy = ax * h3 + bx * h2 + cx * h, ay * h3 + by * h2 + cy * h
+        ddx, ddy = 6 * ax * h3 + 2 * bx * h2, 6 * ay * h3 + 2 * by * h2
+        dddx, dddy = 6 * ax * h3, 6 * ay * h3
+        x, y = x0, y0
+        coords = [x0, y0]
+        for _ in range(samples - 2):
+            x += dx
+            y += dy
+            dx += ddx
+            dy += ddy
+            ddx += dddx
+            ddy += dddy
+            coords.extend((x, y))
+        coords.extend((x3, y3))
         return coords
+
+
+@lru_cache(maxsize=64)
+def _bernstein_basis(samples: int):
+    t = np.linspace(0, 1, samples)[:, None]
+    mt = 1 - t
+    return np.hstack((mt * mt * mt, 3 * mt * mt * t, 3 * mt * t * t, t * t * t))
+
+
+def flatten_beziers(curves: list[CBezier], samples=50, tolerance: float = None) -> list[list[float]]:
+    """Returns the flattened coordinates of many curves in one call.
+
+    Same as calling flatten() on each curve. With numpy installed, curves
+    with the same sample count are evaluated together as one matrix
+    product with a shared, precomputed Bernstein basis."""
+    if tolerance is not None:
+        counts = [c.samples_for_tolerance(tolerance) for c in curves]
+    else:
+        counts = [samples] * len(curves)
+    if np is None:
+        return [c.flatten(n) for c, n in zip(curves, counts)]
+    groups = {}
+    for i, n in enumerate(counts):
+        groups.setdefault(n, []).append(i)
+    result = [None] * len(curves)
+    for n, indices in groups.items():
+        if n < 2:
+            for i in indices:
+                result[i] = curves[i].flatten(n)
+            continue
+        controls = np.array([curves[i].points for i in indices], dtype=float)
+        points = _bernstein_basis(n) @ controls
+        for i, coords in zip(indices, points.reshape(len(indices), -1).tolist()):
+            result[i] = coords
+    return result
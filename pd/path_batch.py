@@ -0,0 +1,138 @@
+from pd import singleton
+from pd.path import Path
+from pd.utils import np, require_numpy
+
+
+class PathBatch():
+
+    def __init__(self, paths: list[Path]):
+        """Stores many Paths in one contiguous coordinate buffer. (requires numpy)
+
+        Item i has the points offsets[i]:offsets[i + 1] of the buffer.
+        Compound Paths keep their subpaths table (see Path.subpaths).
+        Transforms work on all items in one vectorized pass, and draw() draws
+        all items with one pen and brush, so large scenes (particle fields,
+        grids of shapes) avoid the per-Path overhead.
+
+        grid = PathBatch([regular_polygon((x, y), 6, 10) for x, y in centers])
+        grid.rotate(angles).draw("white", None)
+        """
+        require_numpy("PathBatch")
+        arrays = [np.asarray(p._coords, dtype=float) for p in paths]
+        counts = [len(a) // 2 for a in arrays]
+        self.coords = np.concatenate(arrays) if arrays else np.empty(0)
+        self.offsets = np.zeros(len(paths) + 1, dtype=np.intp)
+        np.cumsum(counts, out=self.offsets[1:])
+        self.anchors = np.array([p.anchor for p in paths], dtype=float).reshape(-1, 2)
+        self.closed = [p.is_closed() for p in paths]
+        self.subpaths = [p.subpaths for p in paths]
+        # item index of each point
+        self._items = np.repeat(np.arange(len(paths)), counts)
+        # last points before a jump to the next item or subpath
+        jumps = (self.offsets[1:-1] - 1).tolist()
+        for offset, table in zip(self.offsets.tolist(), self.subpaths):
+            if table:
+                jumps.extend(offset + start - 1 for start, _ in table[1:])
+        self._jumps = np.array(jumps, dtype=np.intp)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i) -> "np.ndarray":
+        """Returns the points of item i as (N, 2) array view"""
+        return self.points[self.offsets[i]:self.offsets[i + 1]]
+
+    @property
+    def points(self):
+        """Returns all points as (N, 2) array view"""
+        return self.coords.reshape(-1, 2)
+
+    def _per_point(self, values):
+        # scalar for the whole batch, or one value per item
+        values = np.asarray(values, dtype=float)
+        return values if values.ndim == 0 else values[self._items]
+
+    def _origins(self, anchor_points):
+        if anchor_points is None:
+            return self.anchors[self._items]
+        anchor_points = np.asarray(anchor_points, dtype=float)
+        return anchor_points if anchor_points.ndim == 1 else anchor_points[self._items]
+
+    def translate(self, x, y):
+        """Translates the items
+
+        x and y are numbers, or arrays with a value for each item."""
+        points = self.points
+        points[:, 0] += self._per_point(x)
+        points[:, 1] += self._per_point(y)
+        self.anchors[:, 0] += x
+        self.anchors[:, 1] += y
+        return self
+
+    def rotate(self, angle, anchor_points=None):
+        """Rotates the items around their anchor points.
+
+        `angle` is a number or an array with an angle for each item.
+        `anchor_points` is one point for the whole batch or an (n, 2)
+        array of points for each item."""
+        origins = self._origins(anchor_points)
+        cos, sin = self._per_point(np.cos(angle)), self._per_point(np.sin(angle))
+        points = self.points
+        dx, dy = points[:, 0] - origins[..., 0], points[:, 1] - origins[..., 1]
+        points[:, 0] = origins[..., 0] + cos * dx - sin * dy
+        points[:, 1] = origins[..., 1] + sin * dx + cos * dy
+        return self
+
+    def scale(self, x, y, anchor_points=None):
+        """Scales the items around their anchor points
+
+        See rotate() for the arguments."""
+        origins = self._origins(anchor_points)
+        points = self.points
+        points[:, 0] = origins[..., 0] + (points[:, 0] - origins[..., 0]) * self._per_point(x)
+        points[:, 1] = origins[..., 1] + (points[:, 1] - origins[..., 1]) * self._per_point(y)
+        return self
+
+    @property
+    def lengths(self):
+        """Returns the length of each item as array"""
+        segments = np.hypot(*np.diff(self.points, axis=0).T)
+        segments = np.append(segments, 0.0)
+        # no segment between items and between the subpaths of an item
+        segments[self._jumps] = 0.0
+        return np.add.reduceat(segments, self.offsets[:-1])
+
+    @property
+    def centroids(self):
+        """Returns the centroid of each item as (n, 2) array"""
+        sums = np.add.reduceat(self.points, self.offsets[:-1])
+        counts = np.diff(self.offsets)
+        closed = np.array(self.closed, dtype=bool)
+        # the closing point repeats the first point
+        sums[closed] -= self.points[self.offsets[1:][closed] - 1]
+        return sums / (counts - closed)[:, None]
+
+    @property
+    def bounds(self):
+        """Returns top-left and bottom-right points of each item as (n, 2) arrays"""
+        starts = self.offsets[:-1]
+        return (np.minimum.reduceat(self.points, starts),
+                np.maximum.reduceat(self.points, starts))
+
+    def to_paths(self) -> list[Path]:
+        """Returns the items as new NumPy-backed Paths"""
+        paths = []
+        for i, anchor in enumerate(self.anchors.tolist()):
+            path = Path(self[i].copy())
+            path.anchor = tuple(anchor)
+            path._subpaths = self.subpaths[i]
+            paths.append(path)
+        return paths
+
+    def draw(self, fill="#181818", stroke="grey", thickness=1.5):
+        """Draws all items on the canvas with one pen and brush"""
+        coords = self.coords.tolist()
+        offsets = (self.offsets * 2).tolist()
+        singleton.draw_paths([coords[start:end] for start, end in zip(offsets, offsets[1:])],
+                             fill, stroke, thickness, self.closed, self.subpaths)
+        return self
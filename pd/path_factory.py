@@ -48,18 +48,24 @@ def circle(origin: tuple, radius, samples=200):
     return ellipse(origin, radius, radius, samples)
 
 
-def cubic_bezier(x0, y0, x1, y1, x2, y2, x3, y3, samples=200):
-    """Returns cubic bezier"""
+def cubic_bezier(x0, y0, x1, y1, x2, y2, x3, y3, samples=200, tolerance=None):
+    """Returns cubic bezier
+
+    If `tolerance` is given, the number of samples is chosen so the path
+    stays within `tolerance` pixels of the curve."""
     cb = CBezier(x0, y0, x1, y1, x2, y2, x3, y3)
-    p = Path(cb.flatten(samples))
+    p = Path(cb.flatten(samples, tolerance))
     p.anchor = p.centroid
     return p
 
 
-def quadratic_bezier(x0, y0, x1, y1, x2, y2, samples=200):
-    """Returns quadratic bezier"""
+def quadratic_bezier(x0, y0, x1, y1, x2, y2, samples=200, tolerance=None):
+    """Returns quadratic bezier
+
+    If `tolerance` is given, the number of samples is chosen so the path
+    stays within `tolerance` pixels of the curve."""
     cb = CBezier(*quadratic_to_cubic(x0, y0, x1, y1, x2, y2))
-    p = Path(cb.flatten(samples))
+    p = Path(cb.flatten(samples, tolerance))
     p.anchor = p.centroid
     return p
 
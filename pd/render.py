@@ -0,0 +1,86 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pd import singleton
+from pd._canvas import Canvas
+from pd.gif import GifWriter
+from pd.utils import linspace
+
+# per worker process state, set by _init_worker()
+_scene, _background = None, "black"
+
+
+def _draw_frame(c: Canvas, scene, t, background):
+    c.clear(background)
+    with c, c.batch():
+        scene(t)
+    c.flush()
+    return c.img.copy()
+
+
+def _init_worker(scene, w, h, background):
+    global _scene, _background
+    _scene, _background = scene, background
+    singleton.canvas(w, h)
+
+
+def _render_frame(t):
+    return _draw_frame(singleton.current_canvas(), _scene, t, _background)
+
+
+def render_frames(scene, n, w, h, workers=None, background="black"):
+    """Yields the frames of an animation in order.
+
+    `scene(t)` is called for each t in linspace(0, 1, n) on a cleared
+    canvas of size (w, h) and draws the frame with the usual drawing
+    functions (clear() and append_frame() are done by the driver).
+    Frames are rendered in a process pool of `workers` processes
+    (default: all cores), each with its own canvas, so `scene` must be
+    a picklable module level function and must only depend on t.
+    `workers=1` renders in the current process.
+
+    Only a few frames per worker are rendered ahead of the consumer, so
+    memory stays bounded when the frames are written slower than they
+    are rendered.
+    """
+    ts = linspace(0, 1, n)
+    if workers == 1:
+        c = Canvas(w, h, background)
+        for t in ts:
+            yield _draw_frame(c, scene, t, background)
+        return
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(scene, w, h, background)) as executor:
+        pending = deque()
+        for t in ts:
+            pending.append(executor.submit(_render_frame, t))
+            if len(pending) > workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def render(scene, n, w, h, filename="anim.gif", ms=20, colours=256, palette=None,
+           workers=None, background="black", sink=None):
+    """Renders an animation in parallel and saves it.
+
+    See render_frames() for `scene`, `n`, `workers` and `background`.
+    Frames are streamed in order to a GIF file (see GifWriter for `ms`,
+    `colours` and `palette`), or to `sink`, an object with append(image)
+    and close() methods.
+
+    def scene(t):
+        point, angle = motion_path.point_and_angle(t)
+        mover.set_pos(point).rotated(angle).draw("deepskyblue", None)
+
+    if __name__ == "__main__":
+        render(scene, 400, 250, 250, "anim.gif", 33.33333)
+    """
+    if sink is None:
+        sink = GifWriter(filename, ms, colours, palette)
+    try:
+        for frame in render_frames(scene, n, w, h, workers, background):
+            sink.append(frame)
+    finally:
+        sink.close()
@@ -1,80 +1,94 @@
-import aggdraw
-from PIL import Image
-from copy import deepcopy
+from pd._canvas import Canvas, active_canvas, get_pen, get_brush
 
+# Module level drawing API. The functions draw on the default Canvas created
+# by canvas(), or on the Canvas activated with `with` in the current thread.
 draw, img, frames = None, None, []
+default_canvas: Canvas = None
+
+
+def current_canvas() -> Canvas:
+    """Returns the Canvas the module functions draw on"""
+    c = active_canvas() or default_canvas
+    if c is None:
+        raise RuntimeError("No canvas. Call canvas(w, h) first.")
+    return c
 
 
 def canvas(w, h):
     """Creates a Canvas (PIL Image surface) of the given size and creates a global aggdraw Draw object to draw on."""
-    global draw, img
-    img = Image.new("RGBA", (w, h), "black")
-    draw = aggdraw.Draw(img)
+    global draw, img, default_canvas
+    default_canvas = Canvas(w, h)
+    default_canvas.frames = frames
+    draw, img = default_canvas.draw, default_canvas.img
+    return default_canvas
+
+
+def flush():
+    """Pushes pending drawing to the canvas image"""
+    current_canvas().flush()
+
+
+def batch():
+    """Batches draw calls and flushes the canvas once at the end.
+
+    with batch():
+        for p in paths:
+            p.draw()
+
+    Pending drawing is also flushed before the image is read
+    by save(), put_pixel() and append_frame().
+    """
+    return current_canvas().batch()
 
 
 def put_pixel(xy: tuple, color: tuple = (255, 255, 255)):
-    global img
-    img.putpixel(xy, color)
+    current_canvas().put_pixel(xy, color)
 
 
 def set_antialiasing(flag=True):
     """True to enable anti-aliasing, false to disable it."""
-    global draw
-    draw.setantialias(flag)
+    current_canvas().set_antialiasing(flag)
 
 
 def clear(color="black"):
     """Fills the canvas with the given color. Default is black"""
-    global draw
-    draw.clear(color)
+    current_canvas().clear(color)
 
 
-def draw_path(coords: list[float], fill=80, stroke="white", thickness=1.5, closed=False):
-    """Draws coordinates as path on global surface"""
+def draw_path(coords: list[float], fill=80, stroke="white", thickness=1.5, closed=False,
+              subpaths=None):
+    """Draws coordinates as path on global surface
 
-    pen = aggdraw.Pen(stroke, thickness) if stroke is not None else None
-    brush = aggdraw.Brush(fill) if fill is not None else None
-    if closed:
-        draw.polygon(coords,  pen, brush)
-    else:
-        draw.path(aggdraw.Path(coords),  pen, brush)
-    draw.flush()
+    See Canvas.draw_path() for `subpaths`."""
+    current_canvas().draw_path(coords, fill, stroke, thickness, closed, subpaths)
 
 
-def draw_ellipse(origin: tuple, radius_x, radius_y, fill=80, stroke="white", thickness=1.5):
-    """Draws ellipse immediately"""
+def draw_paths(paths: list[list[float]], fill=80, stroke="white", thickness=1.5, closed=False,
+               subpaths=None):
+    """Draws many coordinate lists with one pen and brush
 
-    pen = aggdraw.Pen(stroke, thickness) if stroke is not None else None
-    brush = aggdraw.Brush(fill) if fill is not None else None
+    See Canvas.draw_paths()"""
+    current_canvas().draw_paths(paths, fill, stroke, thickness, closed, subpaths)
 
-    x, y = origin[0] - radius_x, origin[1] - radius_y
-    w, h = origin[0] + radius_x, origin[1] + radius_y
 
-    draw.ellipse((x, y, w, h), pen, brush)
-    draw.flush()
+def draw_ellipse(origin: tuple, radius_x, radius_y, fill=80, stroke="white", thickness=1.5):
+    """Draws ellipse immediately"""
+    current_canvas().draw_ellipse(origin, radius_x, radius_y, fill, stroke, thickness)
 
 
 def draw_circle(origin: tuple, radius, fill=80, stroke="white", thickness=1.5):
-    draw_ellipse(origin, radius, radius, fill, stroke, thickness)
+    current_canvas().draw_ellipse(origin, radius, radius, fill, stroke, thickness)
 
 
 def draw_line(start: tuple, end: tuple, stroke="white", thickness=1):
     """Draws line immediately"""
-    global draw
-    pen = aggdraw.Pen(stroke, thickness)
-    draw.line((start[0], start[1], end[0], end[1]), pen)
-    draw.flush()
+    current_canvas().draw_line(start, end, stroke, thickness)
 
 
 def draw_rectangle(xy: tuple, w, h, fill=80, stroke="white", thickness=1.5):
     """The first parameter set the location of the rectangle's upper-left corner.
     The second and third set the shape's the width and height, respectively"""
-
-    pen = aggdraw.Pen(stroke, thickness) if stroke is not None else None
-    brush = aggdraw.Brush(fill) if fill is not None else None
-    coords = (xy[0], xy[1], xy[0] + w, xy[1] + h)
-    draw.rectangle(coords, pen, brush)
-    draw.flush()
+    current_canvas().draw_rectangle(xy, w, h, fill, stroke, thickness)
 
 
 def draw_bbox(upper_left: tuple, bottom_right: tuple, fill=None, stroke="cyan", thickness=1.5):
@@ -82,43 +96,55 @@ def draw_bbox(upper_left: tuple, bottom_right: tuple, fill=None, stroke="cyan",
 
     The first parameter is bounding box's upper-left corner.
     The second is bottom-right corner"""
-
-    pen = aggdraw.Pen(stroke, thickness) if stroke is not None else None
-    brush = aggdraw.Brush(fill) if fill is not None else None
-    draw.rectangle((*upper_left, *bottom_right), pen, brush)
-    draw.flush()
+    current_canvas().draw_bbox(upper_left, bottom_right, fill, stroke, thickness)
 
 
 def save(filename="canvas.png"):
     """Saves current canvas to disk"""
-    global img
-    img.save(filename)
+    current_canvas().save(filename)
 
 
 def append_frame():
     """Appends the current state of the canvas to the list as a keyframe image.
 
     Animation can then be saved with save_gif() .
+    If a frame sink is set (set_sink(), start_gif()), the frame is
+    passed to the sink instead.
     """
-    global img, frames
-    cp = deepcopy(img)
-    frames.append(cp)
+    current_canvas().append_frame()
+
+
+def set_sink(sink):
+    """Sends following append_frame() calls to a frame sink.
+
+    See Canvas.set_sink()
+    """
+    return current_canvas().set_sink(sink)
+
 
+def close_sink():
+    """Waits for the frame sink to finish writing and removes it"""
+    current_canvas().close_sink()
 
-def save_gif(filename="anim.gif", ms=20, colours=256):
+
+def start_gif(filename="anim.gif", ms=20, colours=256, palette=None):
+    """Starts streaming the animation to a GIF file.
+
+    See Canvas.start_gif()
+    """
+    current_canvas().start_gif(filename, ms, colours, palette)
+
+
+def save_gif(filename="anim.gif", ms=20, colours=256, workers=None, processes=False,
+             palette=None):
     """Saves animation as GIF
 
 
-    - 100 MS = 10 FPS  
-    - 50 MS = 20 FPS 
-    - 33.33333 MS = 30 FPS 
-    - 20 MS = 50 FPS 
+    - 100 MS = 10 FPS
+    - 50 MS = 20 FPS
+    - 33.33333 MS = 30 FPS
+    - 20 MS = 50 FPS
+
+    See Canvas.save_gif() for `workers`, `processes` and `palette`.
     """
-    global frames
-    for i in range(len(frames)):
-        frames[i] = frames[i].convert(mode="P",
-                                      dither=False, palette=Image.ADAPTIVE,
-                                      colors=colours)
-    frames[0].save(filename, save_all=True,
-                   append_images=frames[1:], optimize=False,
-                   duration=ms, loop=0)
+    current_canvas().save_gif(filename, ms, colours, workers, processes, palette)
@@ -0,0 +1,131 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from queue import Queue
+from PIL import Image
+
+
+class FrameSink(ABC):
+
+    def __init__(self, queue_size=8):
+        """Base class of animation outputs for append_frame()
+
+        Appended frames are passed to a background thread through a
+        bounded queue, so encoding and disk writes never block the render
+        loop. append() only waits when `queue_size` frames are pending.
+
+        Subclasses implement write(frame), called on the background thread
+        for each frame in order, and optionally finish(), called once
+        after the last frame (also when writing failed).
+        """
+        self.frame_count = 0
+        self._queue = Queue(queue_size)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @abstractmethod
+    def write(self, frame: Image.Image):
+        """Writes one frame"""
+
+    def finish(self):
+        pass
+
+    def append(self, image: Image.Image):
+        """Queues a copy of the image as the next frame"""
+        self._raise_error()
+        self._queue.put(image.copy())
+
+    def close(self):
+        """Waits for queued frames and finishes the output"""
+        self._queue.put(None)
+        self._thread.join()
+        self._raise_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise RuntimeError(
+                f"{type(self).__name__} failed to write frame {self.frame_count}") from self._error
+
+    def _run(self):
+        try:
+            while (frame := self._queue.get()) is not None:
+                self.write(frame)
+                self.frame_count += 1
+        except Exception as e:
+            self._error = e
+            # keep draining so append() never blocks on a dead sink
+            while self._queue.get() is not None:
+                pass
+        finally:
+            try:
+                self.finish()
+            except Exception as e:
+                self._error = self._error or e
+
+
+class PngSequenceSink(FrameSink):
+
+    def __init__(self, pattern="frames/frame_{:04d}.png", compress_level=6, queue_size=8):
+        """Writes each frame as a numbered PNG file.
+
+        `pattern` is formatted with the frame index."""
+        self.pattern = pattern
+        self.compress_level = compress_level
+        directory = os.path.dirname(pattern)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        super().__init__(queue_size)
+
+    def write(self, frame: Image.Image):
+        frame.save(self.pattern.format(self.frame_count),
+                   compress_level=self.compress_level)
+
+
+class _MultiFrameSink(FrameSink):
+    # Pillow encodes APNG and animated WebP in a single save() call,
+    # so frames are collected and encoded on the background thread at close().
+
+    format = None
+
+    def __init__(self, filename, ms=20, loop=0, queue_size=8, **params):
+        self.filename = filename
+        self.ms = ms
+        self.loop = loop
+        self.params = params
+        self._frames = []
+        super().__init__(queue_size)
+
+    def write(self, frame: Image.Image):
+        self._frames.append(frame)
+
+    def finish(self):
+        if self._error is None and self._frames:
+            self._frames[0].save(self.filename, self.format, save_all=True,
+                                 append_images=self._frames[1:],
+                                 duration=self.ms, loop=self.loop, **self.params)
+        self._frames = []
+
+
+class ApngSink(_MultiFrameSink):
+    """Writes frames to an animated PNG file.
+
+    ApngSink("anim.png", ms=20)
+    """
+    format = "PNG"
+
+
+class WebPSink(_MultiFrameSink):
+    """Writes frames to an animated WebP file.
+
+    Extra keyword arguments (lossless, quality, method ...) are passed to Pillow.
+
+    WebPSink("anim.webp", ms=20, lossless=True)
+    """
+    format = "WEBP"
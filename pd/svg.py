@@ -0,0 +1,126 @@
+import math
+import re
+import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pd.path import Path
+from pd.utils import multiply_matrix, rotation_matrix, scale_matrix, translation_matrix
+
+IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+TRANSFORM_RE = re.compile(r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)")
+# elements whose content is only drawn by reference (<use>, clip-path, marker ...)
+NON_RENDERED = {"defs", "clipPath", "mask", "symbol", "marker", "pattern"}
+
+NUMBER_RE = re.compile(r"[-+]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][-+]?[0-9]+)?")
+
+
+def parse_transform(transform: str) -> tuple:
+    """Returns the affine matrix (a, b, c, d, e, f) of an SVG transform attribute
+
+    parse_transform("translate(10 20) rotate(45)")
+    """
+    matrix = IDENTITY
+    for name, args in TRANSFORM_RE.findall(transform or ""):
+        v = [float(n) for n in NUMBER_RE.findall(args)]
+        if name == "matrix":
+            m = tuple(v[:6])
+        elif name == "translate":
+            m = translation_matrix(v[0], v[1] if len(v) > 1 else 0.0)
+        elif name == "scale":
+            m = scale_matrix(v[0], v[1] if len(v) > 1 else v[0])
+        elif name == "rotate":
+            origin = (v[1], v[2]) if len(v) > 2 else (0, 0)
+            m = rotation_matrix(math.radians(v[0]), origin)
+        elif name == "skewX":
+            m = (1.0, 0.0, math.tan(math.radians(v[0])), 1.0, 0.0, 0.0)
+        else:
+            m = (1.0, math.tan(math.radians(v[0])), 0.0, 1.0, 0.0, 0.0)
+        # transforms are applied right to left
+        matrix = multiply_matrix(matrix, m)
+    return matrix
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def iter_path_data(source):
+    """Yields (d string, transform matrix) for each <path> element of an SVG file.
+
+    The file is read with incremental XML parsing. Finished elements are
+    dropped, so memory does not grow with the document size. The matrix
+    combines the `transform` attributes of the element and its parents.
+    Paths inside <defs>, <clipPath>, <mask>, <symbol>, <marker> and
+    <pattern> are skipped, as they are not drawn by themselves.
+    """
+    matrices = [IDENTITY]
+    elements = []
+    # nesting depth inside non-rendered elements
+    hidden = 0
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        name = _local_name(elem.tag)
+        if event == "start":
+            hidden += name in NON_RENDERED
+            transform = elem.get("transform")
+            if transform:
+                matrices.append(multiply_matrix(matrices[-1], parse_transform(transform)))
+            else:
+                matrices.append(matrices[-1])
+            elements.append(elem)
+            continue
+        matrix = matrices.pop()
+        elements.pop()
+        hidden -= name in NON_RENDERED
+        if name == "path" and not hidden:
+            d = elem.get("d", "")
+            if d.strip():
+                yield d, matrix
+        elem.clear()
+        if elements:
+            elements[-1].remove(elem)
+
+
+def _element_path(d: str, matrix: tuple, tolerance=None) -> Path:
+    path = Path(d, tolerance=tolerance)
+    if matrix != IDENTITY:
+        path.transform(matrix)
+    return path
+
+
+def _element_paths(items, tolerance=None) -> list:
+    return [_element_path(d, matrix, tolerance) for d, matrix in items]
+
+
+def iter_svg_paths(source, tolerance=None, workers=None, chunksize=64):
+    """Yields a Path for each <path> element of an SVG file, in document order.
+
+    `source` is a filename or file object. Elements are read one at a time
+    (see iter_path_data()) and their `transform` attributes are applied.
+    `tolerance` is passed to Path for curve flattening.
+
+    With `workers`, the path data is parsed in a pool of worker processes,
+    `chunksize` elements per task. Only a few chunks are in flight at a
+    time, so memory stays flat for bulk conversion jobs too.
+
+    for path in iter_svg_paths("map.svg"):
+        path.draw()
+    """
+    items = iter_path_data(source)
+    if not workers:
+        for d, matrix in items:
+            yield _element_path(d, matrix, tolerance)
+        return
+    with ProcessPoolExecutor(workers) as executor:
+        pending, chunk = deque(), []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) == chunksize:
+                pending.append(executor.submit(_element_paths, chunk, tolerance))
+                chunk = []
+                if len(pending) > workers * 2:
+                    yield from pending.popleft().result()
+        if chunk:
+            pending.append(executor.submit(_element_paths, chunk, tolerance))
+        while pending:
+            yield from pending.popleft().result()
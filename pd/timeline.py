@@ -0,0 +1,128 @@
+from pd.tween import Easings, as_easing, bake
+from pd.utils import np, require_numpy
+
+
+class Timeline():
+
+    def __init__(self, table_size: int = 1024):
+        """Holds many tweens and evaluates the active ones in one batched pass. (requires numpy)
+
+        A tween changes a property from a start value to an end value
+        during [start, start + duration], following an easing. Tweens are
+        kept in an interval index of time buckets with a few levels of
+        bucket widths, so finding the active tweens of a frame looks at one
+        bucket per level. Easings are read from baked lookup tables of
+        `table_size` samples (see tween.bake()).
+
+        timeline = Timeline()
+        timeline.add("x", 0, 200, start=0, duration=1.5, easing=Easings.EASE_OUT_BOUNCE)
+        timeline.add("radius", 5, 20, start=1, duration=0.5)
+        values = timeline.evaluate(t)  # {"x": ..., "radius": ...}
+        """
+        require_numpy("Timeline")
+        self.table_size = table_size
+        self.props = []
+        self._starts, self._durations, self._from, self._to = [], [], [], []
+        self._easing_codes, self._easings = [], {}
+        self._index = None
+
+    def __len__(self):
+        return len(self.props)
+
+    def add(self, prop, start_value: float, end_value: float, start: float, duration: float,
+            easing=Easings.LINEAR):
+        """Adds a tween of `prop` from start_value to end_value.
+
+        `easing` is an Easings member, its name or an easing function.
+        If tweens of the same property overlap, the last added one wins."""
+        if duration < 0:
+            raise ValueError("Duration must not be negative.")
+        if not callable(easing):
+            easing = as_easing(easing)
+        self.props.append(prop)
+        self._starts.append(start)
+        self._durations.append(duration)
+        self._from.append(start_value)
+        self._to.append(end_value)
+        self._easing_codes.append(self._easings.setdefault(easing, len(self._easings)))
+        self._index = None
+        return self
+
+    def _build(self):
+        n = len(self.props)
+        starts = np.array(self._starts, dtype=float)
+        durations = np.array(self._durations, dtype=float)
+        ends = starts + durations
+        t0, span = starts.min(), ends.max() - starts.min()
+        # Level L has buckets of width * 4**L, and each tween goes to the first
+        # level whose buckets are at least as long as the tween. A tween then
+        # overlaps at most two buckets of its level, so the index is O(n).
+        # The base width is the median duration, but at least span / (4 n),
+        # which keeps level 0 to about 4 n buckets.
+        width = max(float(np.median(durations)), span / (4 * n))
+        if width <= 0:
+            width = 1.0
+        with np.errstate(divide="ignore"):
+            tween_levels = np.maximum(0, np.ceil(np.log(durations / width) / np.log(4)))
+        levels = []
+        for level in np.unique(tween_levels).tolist():
+            level_width = width * 4 ** level
+            ids = np.flatnonzero(tween_levels == level)
+            first = ((starts[ids] - t0) // level_width).astype(np.intp)
+            counts = ((ends[ids] - t0) // level_width).astype(np.intp) - first + 1
+            # (bucket, tween) pairs for every bucket a tween overlaps
+            tweens = np.repeat(ids, counts)
+            steps = np.arange(len(tweens)) - np.repeat(np.cumsum(counts) - counts, counts)
+            buckets = np.repeat(first, counts) + steps
+            order = np.argsort(buckets, kind="stable")
+            bucket_offsets = np.searchsorted(buckets[order], np.arange(buckets.max() + 2))
+            levels.append((level_width, tweens[order], bucket_offsets))
+        tables = [bake(easing, self.table_size) for easing in self._easings]
+        self._index = (t0, levels, starts, ends, durations,
+                       np.array(self._from, dtype=float), np.array(self._to, dtype=float),
+                       np.array(self._easing_codes), tables)
+
+    def active(self, t: float):
+        """Returns the indices of the tweens active at time t as array (in order added)"""
+        if not self.props:
+            return np.empty(0, dtype=np.intp)
+        if self._index is None:
+            self._build()
+        t0, levels, starts, ends = self._index[:4]
+        candidates = []
+        for width, tweens, bucket_offsets in levels:
+            k = int((t - t0) // width)
+            if 0 <= k < len(bucket_offsets) - 1:
+                candidates.append(tweens[bucket_offsets[k]:bucket_offsets[k + 1]])
+        if not candidates:
+            return np.empty(0, dtype=np.intp)
+        candidates = np.concatenate(candidates)
+        active = candidates[(starts[candidates] <= t) & (t <= ends[candidates])]
+        active.sort()
+        return active
+
+    def values(self, t: float):
+        """Returns the active tween indices and their values at time t as arrays"""
+        indices = self.active(t)
+        if not len(indices):
+            return indices, np.empty(0)
+        _, _, starts, _, durations, start_values, end_values, codes, tables = self._index
+        d = durations[indices]
+        progress = np.ones(len(indices))
+        moving = d > 0
+        progress[moving] = np.clip((t - starts[indices][moving]) / d[moving], 0.0, 1.0)
+        codes = codes[indices]
+        eased = np.empty(len(indices))
+        for code in np.unique(codes).tolist():
+            selected = codes == code
+            eased[selected] = tables[code].evaluate(progress[selected])
+        a = start_values[indices]
+        return indices, a + (end_values[indices] - a) * eased
+
+    def evaluate(self, t: float) -> dict:
+        """Returns {property: value} of the tweens active at time t
+
+        Properties without an active tween are left out."""
+        indices, values = self.values(t)
+        props = self.props
+        return {props[i]: v for i, v in zip(indices.tolist(), values.tolist())}
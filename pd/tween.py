@@ -1,4 +1,6 @@
 from enum import Enum
+from functools import lru_cache
+from pd.utils import np, is_array
 import math
 
 
@@ -307,3 +309,283 @@ def ease_in_out_bounce(n):
         return ease_in_bounce(n * 2) * 0.5
     else:
         return ease_out_bounce(n * 2 - 1) * 0.5 + 0.5
+
+
+# Array versions of the easing functions (default parameters) for ease_all().
+# They take a float numpy array already checked to be in range 0~1.
+
+def _split(n, condition, if_true, if_false):
+    out = np.empty_like(n)
+    out[condition] = if_true(n[condition])
+    out[~condition] = if_false(n[~condition])
+    return out
+
+
+def _in_out(n, ease_in, ease_out):
+    return _split(n, n < 0.5, lambda n: ease_in(n * 2) * 0.5,
+                  lambda n: ease_out(n * 2 - 1) * 0.5 + 0.5)
+
+
+def _array_linear(n):
+    return n.copy()
+
+
+def _array_ease_in_quad(n):
+    return n**2
+
+
+def _array_ease_out_quad(n):
+    return -n * (n - 2)
+
+
+def _array_ease_in_out_quad(n):
+    return _split(n, n < 0.5, lambda n: 2 * n**2,
+                  lambda n: -0.5 * ((n * 2 - 1) * (n * 2 - 3) - 1))
+
+
+def _array_ease_in_cubic(n):
+    return n**3
+
+
+def _array_ease_out_cubic(n):
+    return (n - 1)**3 + 1
+
+
+def _array_ease_in_out_cubic(n):
+    n = n * 2
+    return _split(n, n < 1, lambda n: 0.5 * n**3, lambda n: 0.5 * ((n - 2)**3 + 2))
+
+
+def _array_ease_in_quart(n):
+    return n**4
+
+
+def _array_ease_out_quart(n):
+    return -((n - 1)**4 - 1)
+
+
+def _array_ease_in_out_quart(n):
+    n = n * 2
+    return _split(n, n < 1, lambda n: 0.5 * n**4, lambda n: -0.5 * ((n - 2)**4 - 2))
+
+
+def _array_ease_in_quint(n):
+    return n**5
+
+
+def _array_ease_out_quint(n):
+    return (n - 1)**5 + 1
+
+
+def _array_ease_in_out_quint(n):
+    n = n * 2
+    return _split(n, n < 1, lambda n: 0.5 * n**5, lambda n: 0.5 * ((n - 2)**5 + 2))
+
+
+def _array_ease_in_poly(n):
+    return n**2
+
+
+def _array_ease_out_poly(n):
+    return 1 - np.abs(n - 1)**2
+
+
+def _array_ease_in_out_poly(n):
+    n = n * 2
+    return _split(n, n < 1, lambda n: 0.5 * n**2, lambda n: 1 - 0.5 * np.abs(n - 2)**2)
+
+
+def _array_ease_in_sine(n):
+    return -1 * np.cos(n * math.pi / 2) + 1
+
+
+def _array_ease_out_sine(n):
+    return np.sin(n * math.pi / 2)
+
+
+def _array_ease_in_out_sine(n):
+    return -0.5 * (np.cos(math.pi * n) - 1)
+
+
+def _array_ease_in_expo(n):
+    return np.where(n == 0, 0.0, 2 ** (10 * (n - 1)))
+
+
+def _array_ease_out_expo(n):
+    return np.where(n == 1, 1.0, -(2 ** (-10 * n)) + 1)
+
+
+def _array_ease_in_out_expo(n):
+    out = _in_out(n, lambda n: 2 ** (10 * (n - 1)), lambda n: -(2 ** (-10 * n)) + 1)
+    out[n == 0], out[n == 1] = 0.0, 1.0
+    return out
+
+
+def _array_ease_in_circ(n):
+    return -1 * (np.sqrt(1 - n * n) - 1)
+
+
+def _array_ease_out_circ(n):
+    return np.sqrt(1 - (n - 1)**2)
+
+
+def _array_ease_in_out_circ(n):
+    n = n * 2
+    return _split(n, n < 1, lambda n: -0.5 * (np.sqrt(1 - n**2) - 1),
+                  lambda n: 0.5 * (np.sqrt(1 - (n - 2)**2) + 1))
+
+
+def _elastic_out(n, period):
+    s = period / (2 * math.pi) * math.asin(1)
+    return 2 ** (-10 * n) * np.sin((n - s) * (2 * math.pi / period)) + 1
+
+
+def _array_ease_in_elastic(n):
+    return 1 - _elastic_out(1 - n, 0.3)
+
+
+def _array_ease_out_elastic(n):
+    return _elastic_out(n, 0.3)
+
+
+def _array_ease_in_out_elastic(n):
+    return _in_out(n, lambda n: 1 - _elastic_out(1 - n, 0.5), lambda n: _elastic_out(n, 0.5))
+
+
+def _array_ease_in_back(n, s=1.70158):
+    return n * n * ((s + 1) * n - s)
+
+
+def _array_ease_out_back(n, s=1.70158):
+    n = n - 1
+    return n * n * ((s + 1) * n + s) + 1
+
+
+def _array_ease_in_out_back(n):
+    s = 1.70158 * 1.525
+    n = n * 2
+    return _split(n, n < 1, lambda n: 0.5 * _array_ease_in_back(n, s),
+                  lambda n: 0.5 * (_array_ease_out_back(n - 1, s) - 1) + 1)
+
+
+def _array_ease_out_bounce(n):
+    return np.select(
+        [n < 1 / 2.75, n < 2 / 2.75, n < 2.5 / 2.75],
+        [7.5625 * n * n,
+         7.5625 * (n - 1.5 / 2.75)**2 + 0.75,
+         7.5625 * (n - 2.25 / 2.75)**2 + 0.9375],
+        7.5625 * (n - 2.65 / 2.75)**2 + 0.984375)
+
+
+def _array_ease_in_bounce(n):
+    return 1 - _array_ease_out_bounce(1 - n)
+
+
+def _array_ease_in_out_bounce(n):
+    return _in_out(n, _array_ease_in_bounce, _array_ease_out_bounce)
+
+
+def as_easing(easing: Easings | str) -> Easings:
+    """Returns the Easings member of a member, its name or its value
+
+    as_easing("EASE_OUT_BOUNCE"), as_easing("ease_out_bounce")
+    """
+    if isinstance(easing, Easings):
+        return easing
+    try:
+        return Easings(easing)
+    except ValueError:
+        if easing in Easings.__members__:
+            return Easings[easing]
+        raise
+
+
+def get_easing(easing: Easings | str):
+    """Returns the easing function of an Easings member or its name (see as_easing())
+
+    get_easing(Easings.EASE_OUT_BOUNCE)(0.5)
+    """
+    return _EASING_FUNCTIONS[as_easing(easing)]
+
+
+def ease(easing: Easings | str, t: float) -> float:
+    """Returns the eased value of t in range 0~1"""
+    return _EASING_FUNCTIONS[as_easing(easing)](t)
+
+
+def ease_all(easing, ts, size: int = None):
+    """Returns the eased values of many t values in range 0~1.
+
+    `easing` is an Easings member, its name or an easing function.
+    With numpy installed, Easings are computed as array operations after
+    one range check. Easing functions are called for each t.
+    With `size`, the values are read from the baked lookup table of the
+    easing (see bake()), which costs a table read for each t.
+    A numpy array of t values returns an array.
+    """
+    if size is not None:
+        return bake(easing, size).evaluate(ts)
+    if np is None or callable(easing):
+        f = easing if callable(easing) else get_easing(easing)
+        return [f(t) for t in ts]
+    values = np.asarray(ts, dtype=float)
+    if values.size and not (0.0 <= values.min() and values.max() <= 1.0):
+        raise ValueError("Argument must be between 0.0 and 1.0.")
+    result = _ARRAY_FUNCTIONS[as_easing(easing)](values)
+    return result if is_array(ts) else result.tolist()
+
+
+@lru_cache(maxsize=64)
+def bake(easing, size: int = 1024) -> "EasingTable":
+    """Returns the easing baked into a lookup table of `size` samples.
+
+    Tables are cached, so bake(Easings.EASE_IN_OUT_SINE) is cheap to call
+    every frame."""
+    return EasingTable(easing, size)
+
+
+class EasingTable():
+
+    def __init__(self, easing, size: int = 1024):
+        """Easing function sampled at `size` evenly spaced t values.
+
+        Values between the samples are linearly interpolated. `easing` is an
+        Easings member, its name or any function of t in range 0~1
+        (e.g. functools.partial(ease_in_poly, degree=3)).
+
+        table = EasingTable(Easings.EASE_OUT_ELASTIC)
+        table(0.25), table.evaluate(ts)
+        """
+        if size < 2:
+            raise ValueError("Table size must be at least 2.")
+        f = easing if callable(easing) else get_easing(easing)
+        self.size = size
+        self.values = [f(i / (size - 1)) for i in range(size)]
+        self._array = None if np is None else np.array(self.values)
+
+    def __call__(self, t: float) -> float:
+        """Returns the interpolated value at t in range 0~1"""
+        _check_range(t)
+        x = t * (self.size - 1)
+        i = min(int(x), self.size - 2)
+        v0, v1 = self.values[i], self.values[i + 1]
+        return v0 + (v1 - v0) * (x - i)
+
+    def evaluate(self, ts):
+        """Returns the interpolated values of many t values in range 0~1.
+
+        Runs as one vectorized table lookup with numpy installed.
+        A numpy array of t values returns an array."""
+        if self._array is None:
+            return [self(t) for t in ts]
+        ts = np.asarray(ts, dtype=float)
+        if ts.size and not (0.0 <= ts.min() and ts.max() <= 1.0):
+            raise ValueError("Argument must be between 0.0 and 1.0.")
+        x = ts * (self.size - 1)
+        i = np.minimum(x.astype(np.intp), self.size - 2)
+        v0 = self._array[i]
+        return v0 + (self._array[i + 1] - v0) * (x - i)
+
+
+_EASING_FUNCTIONS = {easing: globals()[easing.value] for easing in Easings}
+_ARRAY_FUNCTIONS = {easing: globals()["_array_" + easing.value] for easing in Easings}
@@ -1,6 +1,23 @@
 import math
+from bisect import bisect_left
 from colorsys import hsv_to_rgb
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None
+
+
+def is_array(coords) -> bool:
+    """Checks if coords is a numpy array (NumPy-backed Path storage)"""
+    return np is not None and isinstance(coords, np.ndarray)
+
+
+def require_numpy(feature: str):
+    """Raises ImportError if numpy is not installed"""
+    if np is None:
+        raise ImportError(f"{feature} requires numpy. (pip install numpy)")
+
 
 def opposite_angle(angle):
     return (angle + math.pi) % (2 * math.pi)
@@ -17,23 +34,83 @@ def rotate_point(point: tuple, angle, origin: tuple):
 
 def translate(coords: list[float], x, y):
     """Translates xy coordinate sequence"""
+    if is_array(coords):
+        coords[::2] += x
+        coords[1::2] += y
+        return
     coords[::2] = [x_ + x for x_ in coords[::2]]
     coords[1::2] = [y_ + y for y_ in coords[1::2]]
 
 
 def rotate(coords: list[float], angle, origin: tuple):
     """Rotates xy coordinate sequence"""
+    cos, sin = math.cos(angle), math.sin(angle)
+    ox, oy = origin
+    if is_array(coords):
+        x, y = coords[::2] - ox, coords[1::2] - oy
+        coords[::2] = cos * x - sin * y + ox
+        coords[1::2] = sin * x + cos * y + oy
+        return
     for i in range(0, len(coords), 2):
-        coords[i], coords[i +
-                          1] = rotate_point((coords[i], coords[i+1]), angle, origin)
+        x, y = coords[i] - ox, coords[i + 1] - oy
+        coords[i] = cos * x - sin * y + ox
+        coords[i + 1] = sin * x + cos * y + oy
 
 
 def scale(coords, x, y, origin: tuple):
     """Scales xy coordinate sequence"""
+    if is_array(coords):
+        coords[::2] = x * (coords[::2] - origin[0]) + origin[0]
+        coords[1::2] = y * (coords[1::2] - origin[1]) + origin[1]
+        return
     coords[::2] = [x * (x_ - origin[0]) + origin[0] for x_ in coords[::2]]
     coords[1::2] = [y * (y_ - origin[1]) + origin[1] for y_ in coords[1::2]]
 
 
+def transform(coords: list[float], matrix: tuple):
+    """Applies 2D affine matrix (a, b, c, d, e, f) to xy coordinate sequence
+
+    x' = a * x + c * y + e
+    y' = b * x + d * y + f
+    """
+    a, b, c, d, e, f = matrix
+    if is_array(coords):
+        x, y = coords[::2], coords[1::2]
+        coords[::2], coords[1::2] = a * x + c * y + e, b * x + d * y + f
+        return
+    for i in range(0, len(coords), 2):
+        x, y = coords[i], coords[i + 1]
+        coords[i] = a * x + c * y + e
+        coords[i + 1] = b * x + d * y + f
+
+
+def multiply_matrix(m2: tuple, m1: tuple) -> tuple:
+    """Returns the affine matrix that applies m1 first and then m2"""
+    a1, b1, c1, d1, e1, f1 = m1
+    a2, b2, c2, d2, e2, f2 = m2
+    return (a2 * a1 + c2 * b1, b2 * a1 + d2 * b1,
+            a2 * c1 + c2 * d1, b2 * c1 + d2 * d1,
+            a2 * e1 + c2 * f1 + e2, b2 * e1 + d2 * f1 + f2)
+
+
+def translation_matrix(x, y) -> tuple:
+    """Returns translation affine matrix"""
+    return (1.0, 0.0, 0.0, 1.0, x, y)
+
+
+def rotation_matrix(angle, origin: tuple = (0, 0)) -> tuple:
+    """Returns affine matrix of rotation about origin point"""
+    cos, sin = math.cos(angle), math.sin(angle)
+    ox, oy = origin
+    return (cos, sin, -sin, cos,
+            ox - cos * ox + sin * oy, oy - sin * ox - cos * oy)
+
+
+def scale_matrix(x, y, origin: tuple = (0, 0)) -> tuple:
+    """Returns affine matrix of scaling about origin point"""
+    return (x, 0.0, 0.0, y, origin[0] - x * origin[0], origin[1] - y * origin[1])
+
+
 def point_on_circle(center: tuple, radius, angle):
     '''Finding the x, y coordinates on circle, based on given angle.'''
     x = center[0] + (radius * math.cos(angle))
@@ -52,6 +129,8 @@ def is_points_close(p1: tuple, p2: tuple) -> bool:
 
 
 def shift(coords: list, n) -> list:
+    if is_array(coords):
+        return np.roll(coords, -n)
     n = n % len(coords)
     return coords[n:] + coords[:n]
 
@@ -73,10 +152,15 @@ def quadratic_to_cubic(x0, y0, x1, y1, x2, y2):
 def bbox(coords: list[float]):
     """Returns top left and bottom right bounding box xy coordinates as list. [p1, p2]"""
     x_coords, y_coords = coords[::2], coords[1::2]
+    if is_array(coords):
+        return [(float(x_coords.min()), float(y_coords.min())),
+                (float(x_coords.max()), float(y_coords.max()))]
     return [(min(x_coords), min(y_coords)), (max(x_coords), max(y_coords))]
 
 
 def centroid(coords):
+    if is_array(coords):
+        return (float(coords[::2].mean()), float(coords[1::2].mean()))
     total = len(coords) / 2
     return (sum(coords[::2]) / total, sum(coords[1::2]) / total)
 
@@ -111,6 +195,8 @@ def map_range(t: float, a: float, b: float, c: float, d: float):
 
 def calculate_length(coords: list[float]):
     """calculates lenght of xy coords"""
+    if is_array(coords):
+        return float(np.hypot(np.diff(coords[::2]), np.diff(coords[1::2])).sum())
 
     total_length = 0.0
     for i in range(0, len(coords) - 2, 2):
@@ -121,6 +207,28 @@ def calculate_length(coords: list[float]):
     return total_length
 
 
+def cumulative_lengths(coords: list[float], subpaths: tuple = None) -> list[float]:
+    """Returns the running length of xy coords at each point.
+
+    The first item is 0 and the last item is the total length.
+    With `subpaths` ((start point index, closed) pairs), the jumps
+    between subpaths have zero length."""
+    if is_array(coords):
+        segments = np.hypot(np.diff(coords[::2]), np.diff(coords[1::2]))
+        if subpaths:
+            segments[[start - 1 for start, _ in subpaths[1:]]] = 0.0
+        return [0.0] + np.cumsum(segments).tolist()
+    jumps = {start * 2 - 2 for start, _ in subpaths[1:]} if subpaths else ()
+    table = [0.0]
+    total_length = 0.0
+    for i in range(0, len(coords) - 2, 2):
+        if i not in jumps:
+            total_length += math.hypot(coords[i + 2] - coords[i],
+                                       coords[i + 3] - coords[i + 1])
+        table.append(total_length)
+    return table
+
+
 def list2tuples(coords, round_coords=False) -> list[tuple]:
     """Returns path coords as tuple list"""
     if round_coords:
@@ -130,7 +238,7 @@ def list2tuples(coords, round_coords=False) -> list[tuple]:
 
 
 def tuples2list(tuples: list):
-    return list(sum(tuples, ()))
+    return [c for point in tuples for c in point]
 
 
 def remove_doubles(coords: list[float]) -> list[float]:
@@ -160,6 +268,48 @@ def get_pos(coords: list[float], length: float) -> tuple[tuple, float]:
         total_length += segment_length
 
 
+def segment_index(cumlen: list[float], length: float) -> int:
+    """Returns the index of the end point of the segment containing length.
+
+    Binary search over a cumulative_lengths() table."""
+    return bisect_left(cumlen, length, 1, len(cumlen) - 1)
+
+
+def get_pos_at(coords: list[float], cumlen: list[float], length: float) -> tuple[list, float]:
+    """Returns point and tangent angle at the given length on the path.
+
+    Same as get_pos() but uses a cumulative_lengths() table for O(log n) lookup."""
+    i = segment_index(cumlen, length)
+    x1, y1 = coords[i * 2 - 2], coords[i * 2 - 1]
+    x2, y2 = coords[i * 2], coords[i * 2 + 1]
+    segment_length = cumlen[i] - cumlen[i - 1]
+    frac_seg = (length - cumlen[i - 1]) / segment_length if segment_length else 0.0
+    point_x = x1 + (x2 - x1) * frac_seg
+    point_y = y1 + (y2 - y1) * frac_seg
+    return ([point_x, point_y], math.atan2(y2 - y1, x2 - x1))
+
+
+def get_positions(coords: list[float], cumlen: list[float], lengths) -> list[tuple[list, float]]:
+    """Returns points and tangent angles for many lengths on the path.
+
+    The lengths are visited in sorted order with a single sweep over the
+    segments, so the cost is O(n + k) for already sorted input."""
+    result = [None] * len(lengths)
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    i, last = 1, len(cumlen) - 1
+    for j in order:
+        length = lengths[j]
+        while i < last and cumlen[i] < length:
+            i += 1
+        x1, y1 = coords[i * 2 - 2], coords[i * 2 - 1]
+        x2, y2 = coords[i * 2], coords[i * 2 + 1]
+        segment_length = cumlen[i] - cumlen[i - 1]
+        frac_seg = (length - cumlen[i - 1]) / segment_length if segment_length else 0.0
+        result[j] = ([x1 + (x2 - x1) * frac_seg, y1 + (y2 - y1) * frac_seg],
+                     math.atan2(y2 - y1, x2 - x1))
+    return result
+
+
 def linspace(start, stop, num):
     """
     Returns evenly spaced numbers over a specified closed interval.